@@ -0,0 +1,715 @@
+# benchmark.py (Offline Benchmark - TradingView / Telegram မလိုဘဲ main.py ကို တိုင်းတာ)
+"""
+Recorded (သို့) synthetic ideas-page HTML fixtures တွေကို fake WebDriver / mocked httpx နဲ့ replay ပြီး
+scraper နဲ့ /idea handler ကို offline တိုင်းတာမယ်။ Result ကို JSON အဖြစ် သိမ်းလို့ run တစ်ခုနဲ့ တစ်ခု နှိုင်းယှဉ်နိုင်။
+
+    python benchmark.py                          # Default scenarios
+    python benchmark.py --users 1,5,20 --symbols BTCUSDT,ETHUSDT,SOLUSDT
+    python benchmark.py --compare bench_results/previous.json
+    python benchmark.py --webhook-users 20 --concurrent-updates 1   # Webhook mode (update တစ်ခုချင်း) နဲ့ နှိုင်းယှဉ်
+    python benchmark.py --chrome-profiles full,lean   # Chrome အစစ် + network လို (opt-in) - DRIVER_PROFILE နှိုင်းယှဉ်
+    python benchmark.py --real-js                     # Headless Chrome အစစ်ထဲမှာ EXTRACT_CARDS_JS ကို fixture ပေါ် run (opt-in)
+
+Fixture: bench_fixtures/ideas_<SYMBOL>.html (မရှိရင် ပထမ fixture ကို symbol နာမည်လဲပြီး သုံး)။
+<time datetime="@N"> ဆိုတာ "နောက်ဆုံး idea ထက် N စက္ကန့် အရင်"၊ ISO datetime တွေကိုတော့ နောက်ဆုံး idea = အခု ဖြစ်အောင် ရွှေ့မယ်။
+"""
+
+import argparse
+import asyncio
+import glob
+import json
+import logging
+import os
+import re
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import httpx
+from bs4 import BeautifulSoup
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+from telegram.request import BaseRequest
+
+try:
+    import resource # Unix only (peak RSS)
+except ImportError:
+    resource = None
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURE_DIR = os.path.join(BENCH_DIR, 'bench_fixtures')
+RESULTS_DIR = os.path.join(BENCH_DIR, 'bench_results')
+
+# main.py က import လုပ်ချိန်မှာ settings ဖတ်လို့ DB / cache file တွေကို temp dir ထဲ အရင် ညွှန်ထား
+_TMP_DIR = tempfile.mkdtemp(prefix="tradingideas_bench_")
+os.environ.setdefault('IDEA_DB_PATH', os.path.join(_TMP_DIR, 'ideas.db'))
+os.environ.setdefault('PHOTO_FILE_ID_CACHE_PATH', os.path.join(_TMP_DIR, 'photo_file_ids.json'))
+
+import main # noqa: E402
+
+main.logger.setLevel(logging.WARNING)
+REAL_SETUP_SELENIUM_DRIVER = main.setup_selenium_driver # install_fake_driver က အစားထိုးမှာမို့ Chrome profile scenario အတွက် သိမ်းထား
+logging.getLogger('httpx').setLevel(logging.WARNING)
+
+
+# -----------------------------------------------------------------
+# --- Fixtures ---
+# -----------------------------------------------------------------
+class FixtureSet:
+    """Symbol -> ideas page HTML (datetime တွေကို load လုပ်ချိန် အခုအချိန်နဲ့ ညှိ)"""
+
+    def __init__(self, fixture_dir=FIXTURE_DIR):
+        self._pages = {}
+        for path in sorted(glob.glob(os.path.join(fixture_dir, 'ideas_*.html'))):
+            symbol = os.path.basename(path)[len('ideas_'):-len('.html')].upper()
+            with open(path, encoding='utf-8') as f:
+                self._pages[symbol] = f.read()
+        if not self._pages:
+            raise SystemExit(f"No fixtures found in {fixture_dir} (expected ideas_<SYMBOL>.html).")
+        self._default_symbol = next(iter(self._pages))
+
+    def page(self, symbol):
+        symbol = symbol.upper()
+        html = self._pages.get(symbol)
+        if html is None: # Symbol မတူရင် link တွေ မထပ်အောင် နာမည်လဲသုံး
+            html = self._pages[self._default_symbol].replace(self._default_symbol, symbol)
+        return self._rebase_times(html)
+
+    @staticmethod
+    def _rebase_times(html):
+        now_ts = time.time()
+        iso_values = [main.parse_card_timestamp(v, None) for v in re.findall(r'datetime="([^"@][^"]*)"', html)]
+        iso_values = [v for v in iso_values if v is not None]
+        shift = now_ts - max(iso_values) if iso_values else 0
+
+        def rebase(match):
+            value = match.group(1)
+            if value.startswith('@'):
+                ts = now_ts - float(value[1:])
+            else:
+                ts = main.parse_card_timestamp(value, now_ts) + shift
+            return 'datetime="' + datetime.fromtimestamp(ts, tz=timezone.utc).isoformat() + '"'
+
+        return re.sub(r'datetime="([^"]*)"', rebase, html)
+
+
+# -----------------------------------------------------------------
+# --- Fake WebDriver (Chrome မလိုဘဲ fixture ကို Selenium API နဲ့ ပြ) ---
+# -----------------------------------------------------------------
+class FakeElement:
+    def __init__(self, driver, tag):
+        self._driver = driver
+        self._tag = tag
+
+    def find_element(self, by, value):
+        self._driver._round_trip()
+        found = _select(self._tag, by, value, first=True)
+        if found is None: raise NoSuchElementException(f"{by}={value}")
+        return FakeElement(self._driver, found)
+
+    def find_elements(self, by, value):
+        self._driver._round_trip()
+        return [FakeElement(self._driver, tag) for tag in _select(self._tag, by, value)]
+
+    def get_attribute(self, name):
+        self._driver._round_trip()
+        if name == 'innerHTML': return self._tag.decode_contents()
+        value = self._tag.get(name)
+        if name == 'href' and value and value.startswith('/'): # Browser က absolute URL ပြန်ပေး
+            value = "https://www.tradingview.com" + value
+        return value
+
+    @property
+    def text(self):
+        self._driver._round_trip()
+        return self._tag.get_text(" ", strip=True)
+
+    def is_displayed(self): return True
+    def is_enabled(self): return True
+    def click(self): self._driver._round_trip()
+
+
+def _select(tag, by, value, first=False):
+    if by == By.TAG_NAME:
+        return tag.find(value) if first else tag.find_all(value)
+    if by == By.CSS_SELECTOR:
+        return tag.select_one(value) if first else tag.select(value)
+    raise NotImplementedError(by)
+
+
+class FakeDriver:
+    """fetch_ideas_selenium သုံးတဲ့ WebDriver API အပိုင်းကို fixture HTML နဲ့ အတုလုပ်
+
+    WebDriver call တိုင်း (chromedriver HTTP round trip) ကို rpc_latency စက္ကန့် sleep နဲ့ simulate လုပ်ပြီး ရေတွက်မယ်။
+    """
+
+    def __init__(self, fixtures, page_load_seconds=0.0, rpc_latency=0.0):
+        self._fixtures = fixtures
+        self.page_load_seconds = page_load_seconds
+        self.rpc_latency = rpc_latency
+        self.round_trips = 0
+        self.current_url = "about:blank"
+        self.page_source = ""
+        self._soup = BeautifulSoup("", "html.parser")
+
+    def _round_trip(self):
+        self.round_trips += 1
+        if self.rpc_latency: time.sleep(self.rpc_latency)
+
+    def get(self, url):
+        self._round_trip()
+        symbol = url.rstrip('/').split('/')[-2]
+        self.page_source = self._fixtures.page(symbol)
+        self._soup = BeautifulSoup(self.page_source, "html.parser")
+        self.current_url = url
+        if self.page_load_seconds: time.sleep(self.page_load_seconds)
+
+    def find_element(self, by, value):
+        return FakeElement(self, self._soup).find_element(by, value)
+
+    def find_elements(self, by, value):
+        return FakeElement(self, self._soup).find_elements(by, value)
+
+    def execute_script(self, script, *args):
+        """EXTRACT_CARDS_JS ကို တကယ် မ run - BeautifulSoup (raw_cards_from_html) နဲ့ result ပုံစံတူ ပြန်ပေးရုံ
+
+        ဒါကြောင့် selenium_scrape.js_simulated က JS selector / field mapping ကို မစစ်၊ round trip + Python post-processing ပဲ တိုင်း။
+        JS အစစ်ကို --real-js (bench_real_js_extraction) နဲ့ တိုင်းပါ။
+        """
+        self._round_trip()
+        if script == main.EXTRACT_CARDS_JS:
+            return {'cards': main.raw_cards_from_html(self.page_source), 'skipped': 0}
+        return None
+
+    def execute_cdp_cmd(self, cmd, params):
+        self._round_trip()
+
+    def quit(self):
+        pass
+
+
+def install_fake_driver(fixtures, page_load_seconds, rpc_latency, pool_size):
+    """main.setup_selenium_driver ကို FakeDriver နဲ့ အစားထိုးပြီး driver pool အသစ် ဆောက်"""
+    drivers = []
+
+    def setup_fake_driver():
+        driver = FakeDriver(fixtures, page_load_seconds, rpc_latency)
+        drivers.append(driver)
+        return driver
+
+    main.setup_selenium_driver = setup_fake_driver
+    main.DRIVER_POOL = main.DriverPool(size=pool_size)
+    main.DRIVER_POOL.warm_up()
+    return drivers
+
+
+def install_fake_http(fixtures, latency_seconds):
+    """main.HTTP_CLIENT ကို fixture ပြန်ပေးမယ့် mocked transport နဲ့ အစားထိုး"""
+    async def handler(request):
+        if latency_seconds: await asyncio.sleep(latency_seconds)
+        symbol = request.url.path.rstrip('/').split('/')[-2]
+        return httpx.Response(200, text=fixtures.page(symbol))
+
+    main.HTTP_CLIENT = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+UNTHROTTLED_RATE = 10 ** 6 # messages/second - limiter ရှိပေမယ့် ဘယ်တော့မှ မစောင့်ရ
+
+
+def limiter_settings(rate_limit):
+    """--telegram-rate-limit ပေးမှ production limit၊ မပေးရင် scrape / scheduler ကြာချိန်ပဲ ပေါ်အောင် unthrottled"""
+    if rate_limit:
+        return {'global_rate': main.TELEGRAM_GLOBAL_RATE, 'per_chat_rate': main.TELEGRAM_PER_CHAT_RATE,
+                'per_chat_burst': main.TELEGRAM_PER_CHAT_BURST}
+    return {'global_rate': UNTHROTTLED_RATE, 'per_chat_rate': UNTHROTTLED_RATE, 'per_chat_burst': UNTHROTTLED_RATE}
+
+
+def reset_state(workers, rate_limit=False):
+    """Run တစ်ခုချင်းစီကို cache / store အလွတ်ကနေ စ"""
+    main.IDEA_CACHE = main.IdeaCache(ttl=0, stale_ttl=0)
+    main.IDEA_STORE.close()
+    fd, db_path = tempfile.mkstemp(suffix='.db', dir=_TMP_DIR)
+    os.close(fd)
+    main.IDEA_STORE = main.IdeaStore(db_path)
+    main.SCRAPE_SCHEDULER = main.ScrapeScheduler(workers=workers, max_queue_size=10000)
+    main.TELEGRAM_RATE_LIMITER = main.TelegramRateLimiter(**limiter_settings(rate_limit))
+
+
+# -----------------------------------------------------------------
+# --- Fake Telegram (Update / Context / Bot) ---
+# -----------------------------------------------------------------
+class FakeUser:
+    def __init__(self, user_id):
+        self.id = user_id
+        self.username = f"bench{user_id}"
+        self.first_name = f"Bench {user_id}"
+
+
+class FakeMessage:
+    def __init__(self, recorder, user_id):
+        self.from_user = FakeUser(user_id)
+        self.chat_id = user_id
+        self._recorder = recorder
+
+    async def reply_text(self, text, **kwargs):
+        await self._recorder.record(self.chat_id, 'reply_text', is_idea=False)
+
+
+class FakeUpdate:
+    def __init__(self, recorder, user_id):
+        self.message = FakeMessage(recorder, user_id)
+
+
+class FakeContext:
+    def __init__(self, bot, args):
+        self.bot = bot
+        self.args = args
+
+
+class _FakePhotoSize:
+    def __init__(self, file_id):
+        self.file_id = file_id
+
+
+class _FakeSentMessage:
+    def __init__(self, photo_ref=None):
+        self.photo = [_FakePhotoSize(f"file-{abs(hash(photo_ref))}")] if photo_ref else []
+
+
+class FakeBot:
+    """Bot API call တွေကို latency အတုနဲ့ မှတ်တမ်းတင်ပြီး chat တစ်ခုချင်း ပထမ idea ရောက်ချိန်ကို မှတ်"""
+
+    def __init__(self, send_latency=0.0):
+        self.send_latency = send_latency
+        self.calls = []
+        self.first_idea_at = {} # chat_id -> monotonic time
+
+    async def record(self, chat_id, method, is_idea=True, items=1):
+        if self.send_latency: await asyncio.sleep(self.send_latency)
+        now = time.monotonic()
+        self.calls.append((chat_id, method, items))
+        if is_idea: self.first_idea_at.setdefault(chat_id, now)
+
+    async def send_photo(self, chat_id, photo, **kwargs):
+        await self.record(chat_id, 'send_photo')
+        return _FakeSentMessage(photo)
+
+    async def send_message(self, chat_id, text, **kwargs):
+        is_idea = not text.startswith("⬆️") # Album link button message က idea မဟုတ်
+        await self.record(chat_id, 'send_message', is_idea=is_idea)
+        return _FakeSentMessage()
+
+    async def send_media_group(self, chat_id, media, **kwargs):
+        await self.record(chat_id, 'send_media_group', items=len(media))
+        return [_FakeSentMessage(item.media) for item in media]
+
+
+class FakeBotApiRequest(BaseRequest):
+    """Application ထဲက Bot အစစ်ရဲ့ Bot API call တွေကို network မသုံးဘဲ ဖြေပြီး FakeBot recorder ထဲ မှတ် (webhook scenario)"""
+
+    def __init__(self, recorder):
+        self._recorder = recorder
+        self._message_id = 0
+
+    @property
+    def read_timeout(self):
+        return None
+
+    async def initialize(self):
+        pass
+
+    async def shutdown(self):
+        pass
+
+    def _message(self, chat_id, photo_ref=None):
+        self._message_id += 1
+        message = {'message_id': self._message_id, 'date': int(time.time()), 'chat': {'id': chat_id, 'type': 'private'}}
+        if photo_ref:
+            file_id = f"file-{abs(hash(photo_ref))}"
+            message['photo'] = [{'file_id': file_id, 'file_unique_id': file_id, 'width': 800, 'height': 600}]
+        return message
+
+    async def do_request(self, url, method, request_data=None, **kwargs):
+        api_method = url.rsplit('/', 1)[-1]
+        params = request_data.parameters if request_data else {}
+        chat_id = params.get('chat_id')
+        if api_method == 'getMe':
+            result = {'id': 1, 'is_bot': True, 'first_name': 'Bench', 'username': 'bench_bot'}
+        elif api_method == 'sendPhoto':
+            await self._recorder.record(chat_id, 'send_photo')
+            result = self._message(chat_id, params.get('photo'))
+        elif api_method == 'sendMediaGroup':
+            media = params.get('media', [])
+            await self._recorder.record(chat_id, 'send_media_group', items=len(media))
+            result = [self._message(chat_id, item.get('media')) for item in media]
+        elif api_method == 'sendMessage':
+            # Status reply နဲ့ album link message တွေ (fixture ideas တွေမှာ ပုံ အမြဲပါ)
+            await self._recorder.record(chat_id, 'send_message', is_idea=False)
+            result = self._message(chat_id)
+        else:
+            result = True
+        return 200, json.dumps({'ok': True, 'result': result}).encode()
+
+
+def fake_update_json(update_id, user_id, text):
+    """Telegram က webhook ဆီ POST လုပ်မယ့် command message update"""
+    command_length = len(text.split()[0])
+    return {
+        'update_id': update_id,
+        'message': {
+            'message_id': update_id, 'date': int(time.time()), 'text': text,
+            'chat': {'id': user_id, 'type': 'private'},
+            'from': {'id': user_id, 'is_bot': False, 'first_name': f"Bench {user_id}", 'username': f"bench{user_id}"},
+            'entities': [{'type': 'bot_command', 'offset': 0, 'length': command_length}],
+        },
+    }
+
+
+# -----------------------------------------------------------------
+# --- Scenarios ---
+# -----------------------------------------------------------------
+def percentile(values, pct):
+    if not values: return None
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+
+def summarize(latencies):
+    return {
+        'count': len(latencies),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 2) if latencies else None,
+        'p95_ms': round(percentile(latencies, 95) * 1000, 2) if latencies else None,
+        'mean_ms': round(statistics.mean(latencies) * 1000, 2) if latencies else None,
+    }
+
+
+def bench_selenium_scrape(fixtures, symbol, iterations, rpc_latency):
+    """fetch_ideas_selenium ကို FakeDriver နဲ့ extraction mode တစ်ခုချင်းစီ တိုင်း
+
+    js_simulated: JS bulk path ရဲ့ round trip အရေအတွက်နဲ့ Python post-processing သာ (JS ကိုယ်တိုင် မ run - FakeDriver.execute_script ကြည့်)
+    element: per-element fallback (WebDriver call တိုင်းကို rpc_latency နဲ့ simulate)
+    """
+    results = {}
+    for label, mode in (('js_simulated', 'js'), ('element', 'element')):
+        main.CARD_EXTRACTION_MODE = mode
+        drivers = install_fake_driver(fixtures, 0.0, rpc_latency, pool_size=1)
+        latencies = []
+        ideas_count = 0
+        for _ in range(iterations):
+            started = time.perf_counter()
+            ideas = main.fetch_ideas_selenium(symbol)
+            latencies.append(time.perf_counter() - started)
+            ideas_count = len(ideas or [])
+        round_trips = sum(driver.round_trips for driver in drivers)
+        results[label] = dict(summarize(latencies), ideas=ideas_count,
+                             webdriver_round_trips_per_scrape=round(round_trips / iterations, 1))
+        main.DRIVER_POOL.shutdown()
+    return results
+
+
+async def bench_http_scrape(fixtures, symbol, iterations, http_latency):
+    install_fake_http(fixtures, http_latency)
+    latencies = []
+    ideas_count = 0
+    for _ in range(iterations):
+        started = time.perf_counter()
+        ideas = await main.fetch_ideas_http(symbol)
+        latencies.append(time.perf_counter() - started)
+        ideas_count = len(ideas or [])
+    await main.close_http_client()
+    return dict(summarize(latencies), ideas=ideas_count)
+
+
+async def bench_idea_command(fixtures, args, users):
+    """users ယောက် တစ်ပြိုင်နက် /idea ခေါ်တဲ့ scenario"""
+    reset_state(args.workers, args.telegram_rate_limit)
+    main.SCRAPE_ENGINE = args.engine
+    main.CARD_EXTRACTION_MODE = 'js'
+    install_fake_driver(fixtures, args.page_load_ms / 1000, args.rpc_ms / 1000, pool_size=args.workers)
+    install_fake_http(fixtures, args.page_load_ms / 1000)
+    await main.SCRAPE_SCHEDULER.start()
+
+    bot = FakeBot(args.send_ms / 1000)
+    latencies = []
+    first_reply = []
+
+    async def one_user(user_id):
+        update = FakeUpdate(bot, user_id)
+        started = time.monotonic()
+        await main.idea_command(update, FakeContext(bot, [",".join(args.symbols)]))
+        latencies.append(time.monotonic() - started)
+        if user_id in bot.first_idea_at:
+            first_reply.append(bot.first_idea_at[user_id] - started)
+
+    wall_started = time.monotonic()
+    await asyncio.gather(*(one_user(user_id) for user_id in range(1, users + 1)))
+    wall_seconds = time.monotonic() - wall_started
+
+    await main.SCRAPE_SCHEDULER.stop()
+    await main.close_http_client()
+    main.DRIVER_POOL.shutdown()
+    return {
+        'users': users,
+        'latency': summarize(latencies),
+        'time_to_first_reply': summarize(first_reply),
+        'throughput_requests_per_s': round(users / wall_seconds, 3),
+        'wall_seconds': round(wall_seconds, 3),
+        'telegram_calls': len(bot.calls),
+    }
+
+
+async def bench_webhook(fixtures, args, users):
+    """Fake Telegram client က users ယောက်စာ /start + /idea update တွေကို webhook server ဆီ တစ်ပြိုင်နက် POST တဲ့ scenario"""
+    reset_state(args.workers, args.telegram_rate_limit)
+    main.SCRAPE_ENGINE = args.engine
+    main.CARD_EXTRACTION_MODE = 'js'
+    main.CONCURRENT_UPDATES = args.concurrent_updates
+    install_fake_driver(fixtures, args.page_load_ms / 1000, args.rpc_ms / 1000, pool_size=args.workers)
+    install_fake_http(fixtures, args.page_load_ms / 1000)
+    await main.SCRAPE_SCHEDULER.start()
+
+    bot = FakeBot(args.send_ms / 1000)
+    application = main.build_application(request=FakeBotApiRequest(bot))
+    ack_latencies = []
+    statuses = []
+    async with application:
+        await application.start()
+        server = await main.start_webhook_server(application, host='127.0.0.1', port=0)
+        url = f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}{main.WEBHOOK_PATH}"
+        updates = []
+        for user_id in range(1, users + 1):
+            updates.append(fake_update_json(len(updates) + 1, user_id, "/start"))
+            updates.append(fake_update_json(len(updates) + 1, user_id, f"/idea {','.join(args.symbols)}"))
+
+        async def post(client, update):
+            started = time.monotonic()
+            response = await client.post(url, json=update)
+            ack_latencies.append(time.monotonic() - started)
+            statuses.append(response.status_code)
+
+        wall_started = time.monotonic()
+        async with httpx.AsyncClient(timeout=30) as client:
+            await asyncio.gather(*(post(client, update) for update in updates))
+        await application.stop() # Queue ထဲ ရောက်ပြီးသား update အားလုံး ပြီးအောင် စောင့်
+        wall_seconds = time.monotonic() - wall_started
+        server.close()
+
+    await main.SCRAPE_SCHEDULER.stop()
+    await main.close_http_client()
+    main.DRIVER_POOL.shutdown()
+    return {
+        'users': users,
+        'concurrent_updates': args.concurrent_updates,
+        'webhook_ack': summarize(ack_latencies),
+        'non_200_responses': sum(1 for status in statuses if status != 200),
+        'time_to_first_reply': summarize([at - wall_started for at in bot.first_idea_at.values()]),
+        'wall_seconds': round(wall_seconds, 3),
+        'telegram_calls': len(bot.calls),
+    }
+
+
+def bench_real_js_extraction(fixtures, symbol, iterations):
+    """Headless Chrome အစစ်ထဲမှာ fixture page ကို ဖွင့်ပြီး EXTRACT_CARDS_JS ကို တကယ် run - latency နဲ့ BeautifulSoup result နဲ့ ကိုက်မကိုက် စစ်
+
+    Chrome / chromedriver လိုလို့ --real-js ပေးမှ run (network မလို)။
+    """
+    html = fixtures.page(symbol).replace("<head>", '<head><base href="https://www.tradingview.com/">', 1) # Relative link တွေကို page အစစ်လို resolve
+    page_path = os.path.join(_TMP_DIR, f"real_js_{symbol}.html")
+    with open(page_path, 'w', encoding='utf-8') as f:
+        f.write(html)
+    expected = main.raw_cards_from_html(html)
+
+    driver = REAL_SETUP_SELENIUM_DRIVER()
+    if driver is None: return {'error': "Chrome driver setup failed"}
+    latencies = []
+    raw_cards = None
+    try:
+        driver.get("file://" + os.path.abspath(page_path))
+        for _ in range(iterations):
+            started = time.perf_counter()
+            raw_cards = main.extract_raw_cards_js(driver)
+            latencies.append(time.perf_counter() - started)
+    finally:
+        driver.quit()
+    if raw_cards is None: return {'error': "EXTRACT_CARDS_JS failed"}
+
+    fields = ('title', 'link', 'datetime', 'image_src', 'strategy', 'likes_text')
+    mismatches = [f"card {i}: {field}" for i, (got, want) in enumerate(zip(raw_cards, expected)) for field in fields
+                  if (got.get(field) or '').strip() != (want.get(field) or '').strip()]
+    mismatches += [f"card {i}: summary" for i, (got, want) in enumerate(zip(raw_cards, expected))
+                   if main.clean_html(got.get('summary')) != main.clean_html(want.get('summary'))]
+    return dict(summarize(latencies), cards=len(raw_cards), expected_cards=len(expected), field_mismatches=mismatches[:20])
+
+
+def bench_chrome_profiles(symbol, profiles, iterations):
+    """Chrome အစစ်နဲ့ TradingView ideas page ကို DRIVER_PROFILE တစ်ခုချင်း load ပြီး time-to-first-article နဲ့ Chrome RSS တိုင်း
+
+    Fixture / fake driver မသုံး (lean profile ရဲ့ request blocking က network အစစ်မှာပဲ သက်ရောက်) - --chrome-profiles ပေးမှ run။
+    """
+    url = main.TRADINGVIEW_SYMBOL_IDEAS_BASE_URL.format(symbol=symbol.upper())
+    original_profile = main.DRIVER_PROFILE
+    results = {}
+    try:
+        for profile in profiles:
+            main.DRIVER_PROFILE = profile
+            started = time.perf_counter()
+            driver = REAL_SETUP_SELENIUM_DRIVER()
+            if driver is None:
+                results[profile] = {'error': "Chrome driver setup failed"}
+                continue
+            startup_seconds = time.perf_counter() - started
+            first_article = []
+            rss_samples = []
+            timeouts = 0
+            try:
+                for _ in range(iterations):
+                    started = time.perf_counter()
+                    driver.get(url)
+                    try:
+                        WebDriverWait(driver, 45).until(EC.presence_of_element_located((By.TAG_NAME, "article")))
+                        first_article.append(time.perf_counter() - started)
+                    except TimeoutException:
+                        timeouts += 1
+                    rss_mb = main.DriverPool._driver_rss_mb(driver)
+                    if rss_mb is not None: rss_samples.append(rss_mb)
+                    driver.get("about:blank")
+            finally:
+                driver.quit()
+            results[profile] = {
+                'driver_startup_ms': round(startup_seconds * 1000, 2),
+                'time_to_first_article': summarize(first_article),
+                'article_timeouts': timeouts,
+                'mean_rss_mb': round(statistics.mean(rss_samples), 1) if rss_samples else None,
+                'peak_rss_mb': round(max(rss_samples), 1) if rss_samples else None,
+            }
+    finally:
+        main.DRIVER_PROFILE = original_profile
+    return results
+
+
+def bench_enrichment(fixtures, symbol, batch_size, iterations):
+    """enrich_ideas ကို batch_size ခုပါတဲ့ idea list ပေါ်မှာ run ပြီး ideas/second တိုင်း
+
+    Fixture card တွေကို strategy icon ဖယ်ပြီး (keyword inference လုပ်ရအောင်) summary ကို HTML markup ထည့်ပြီး ပွားသုံးမယ်။
+    """
+    raw_cards = main.raw_cards_from_html(fixtures.page(symbol))
+    template = []
+    for card in raw_cards:
+        idea = main.ideas_from_raw_cards([dict(card, strategy=None)], symbol)
+        if not idea: continue
+        summary = card.get('summary') or ''
+        template.append(dict(idea[0], type='Unknown', position_emoji='⚪️',
+                             summary=f"<p>{summary} &amp; <b>{card['title']}</b><br/>Watching the daily close &amp; volume.</p>"))
+    if not template: return {}
+
+    latencies = []
+    inferred = 0
+    for _ in range(iterations):
+        batch = [dict(template[i % len(template)]) for i in range(batch_size)]
+        started = time.perf_counter()
+        main.enrich_ideas(batch)
+        latencies.append(time.perf_counter() - started)
+        inferred = sum(1 for idea in batch if idea['type'] != 'Unknown')
+    return dict(summarize(latencies), batch_size=batch_size, positions_inferred=inferred,
+                ideas_per_s=round(batch_size / statistics.median(latencies)))
+
+
+def peak_rss_mb():
+    if resource is None: return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024, 1) # macOS: bytes, Linux: KB
+
+
+def compare(current, previous_path):
+    """Latency metric တွေကို အရင် run နဲ့ % နှိုင်းယှဉ်ပြ"""
+    with open(previous_path, encoding='utf-8') as f:
+        previous = json.load(f)
+
+    def walk(cur, prev, path):
+        if isinstance(cur, dict) and isinstance(prev, dict):
+            for key in cur:
+                if key in prev: walk(cur[key], prev[key], f"{path}.{key}" if path else key)
+        elif isinstance(cur, list) and isinstance(prev, list): # idea_command runs (users အလိုက်)
+            previous_runs = {run.get('users'): run for run in prev if isinstance(run, dict)}
+            for run in cur:
+                if isinstance(run, dict) and run.get('users') in previous_runs:
+                    walk(run, previous_runs[run['users']], f"{path}[users={run['users']}]")
+        elif isinstance(cur, (int, float)) and isinstance(prev, (int, float)) and prev and path.endswith(('_ms', '_per_s', '_mb')):
+            change = (cur - prev) / prev * 100
+            print(f"  {path}: {prev} -> {cur} ({change:+.1f}%)")
+
+    print(f"Compared with {previous_path}:")
+    walk(current['results'], previous.get('results', {}), "")
+
+
+async def run(args):
+    fixtures = FixtureSet(args.fixtures)
+    symbol = args.symbols[0]
+    results = {
+        'selenium_scrape': await asyncio.to_thread(bench_selenium_scrape, fixtures, symbol, args.iterations, args.rpc_ms / 1000),
+        'http_scrape': await bench_http_scrape(fixtures, symbol, args.iterations, 0.0),
+        'enrichment': bench_enrichment(fixtures, symbol, args.enrich_batch, args.iterations),
+        'idea_command': [await bench_idea_command(fixtures, args, users) for users in args.users],
+        'webhook': [await bench_webhook(fixtures, args, users) for users in args.webhook_users],
+    }
+    if args.real_js:
+        results['real_js_extraction'] = await asyncio.to_thread(bench_real_js_extraction, fixtures, symbol, args.iterations)
+    if args.chrome_profiles:
+        results['chrome_profiles'] = await asyncio.to_thread(bench_chrome_profiles, symbol, args.chrome_profiles, args.chrome_iterations)
+    results['peak_rss_mb'] = peak_rss_mb()
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': sys.version.split()[0],
+        'config': {
+            'symbols': args.symbols, 'users': args.users, 'iterations': args.iterations, 'workers': args.workers,
+            'engine': args.engine, 'page_load_ms': args.page_load_ms, 'rpc_ms': args.rpc_ms, 'send_ms': args.send_ms,
+            'webhook_users': args.webhook_users, 'concurrent_updates': args.concurrent_updates, 'enrich_batch': args.enrich_batch,
+            'chrome_profiles': args.chrome_profiles, 'chrome_iterations': args.chrome_iterations, 'real_js': args.real_js,
+            'telegram_rate_limit': dict(limiter_settings(args.telegram_rate_limit), enabled=args.telegram_rate_limit),
+        },
+        'results': results,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Offline benchmark for the TradingView ideas bot.")
+    parser.add_argument('--symbols', default='BTCUSDT,ETHUSDT,SOLUSDT', type=lambda s: [x.strip().upper() for x in s.split(',') if x.strip()])
+    parser.add_argument('--users', default='1,5,20', type=lambda s: [int(x) for x in s.split(',')], help="Concurrent /idea users per run")
+    parser.add_argument('--iterations', default=20, type=int, help="Scrape iterations per extraction mode")
+    parser.add_argument('--workers', default=main.SCRAPE_CONCURRENCY, type=int, help="Scrape scheduler workers / driver pool size")
+    parser.add_argument('--engine', default='selenium', choices=['auto', 'http', 'selenium'])
+    parser.add_argument('--page-load-ms', default=200.0, type=float, help="Simulated page load time")
+    parser.add_argument('--rpc-ms', default=1.0, type=float, help="Simulated chromedriver round-trip time")
+    parser.add_argument('--send-ms', default=20.0, type=float, help="Simulated Telegram API latency")
+    parser.add_argument('--webhook-users', default='5', type=lambda s: [int(x) for x in s.split(',') if x.strip()],
+                        help="Users posting updates to the webhook server per run (empty to skip)")
+    parser.add_argument('--concurrent-updates', default=main.CONCURRENT_UPDATES, type=int, help="Application concurrent_updates")
+    parser.add_argument('--telegram-rate-limit', action='store_true',
+                        help="Use the production Telegram token buckets (default: unthrottled, so results measure scraping / scheduling)")
+    parser.add_argument('--real-js', action='store_true', help="Run EXTRACT_CARDS_JS in real headless Chrome on the fixture (needs Chrome)")
+    parser.add_argument('--chrome-profiles', default='', type=lambda s: [x.strip().lower() for x in s.split(',') if x.strip()],
+                        help="DRIVER_PROFILE values to compare with real Chrome against tradingview.com (e.g. full,lean; empty to skip)")
+    parser.add_argument('--chrome-iterations', default=5, type=int, help="Page loads per Chrome profile")
+    parser.add_argument('--enrich-batch', default=5000, type=int, help="Ideas per enrich_ideas batch")
+    parser.add_argument('--fixtures', default=FIXTURE_DIR)
+    parser.add_argument('--output', default=None, help="Result JSON path (default: bench_results/bench-<timestamp>.json)")
+    parser.add_argument('--compare', default=None, help="Previous result JSON to compare against")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    report = asyncio.run(run(args))
+
+    output = args.output or os.path.join(RESULTS_DIR, f"bench-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(json.dumps(report['results'], indent=2, ensure_ascii=False))
+    print(f"Results saved to {output}")
+    if args.compare: compare(report, args.compare)
@@ -1,6 +1,7 @@
 # main.py (Selenium Polling, Advanced Reply Logic)
 
 import requests
+import httpx
 import time
 import json
 from datetime import datetime, timezone, timedelta
@@ -8,12 +9,21 @@ import os
 import asyncio
 import logging
 import re
+import hmac
+import html
+from html.parser import HTMLParser
+import sqlite3
+import threading
+import signal
+import multiprocessing
+from contextlib import contextmanager
+from collections import OrderedDict, deque
 from bs4 import BeautifulSoup # <-- Summary သန့်စင်ဖို့ ဆက်သုံးနိုင်
 
 # --- Telegram Bot Library ---
-from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup, InputMediaPhoto
 from telegram.constants import ParseMode
-from telegram.error import TelegramError
+from telegram.error import TelegramError, RetryAfter, BadRequest, Forbidden
 from telegram.ext import Application, CommandHandler, ContextTypes
 
 # --- Selenium Imports (ပြန်ထည့်ပါ) ---
@@ -23,7 +33,7 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
 
 # config.py file ထဲက setting တွေကို import လုပ်ခြင်း
 try:
@@ -31,6 +41,10 @@ try:
 except ImportError:
     print("Error: config.py file ကို ရှာမတွေ့ပါ (သို့) BOT_TOKEN မရှိပါ။")
     exit()
+try:
+    from config import ADMIN_USER_ID # /stats ကို admin တစ်ယောက်တည်း သုံးခွင့်
+except ImportError:
+    ADMIN_USER_ID = None
 
 # --- Settings ---
 # Selenium Driver Paths (Render မှာဆိုရင် Auto-Install လုပ်ရနိုင်)
@@ -43,9 +57,88 @@ BROWSER_PATH_LOCAL = os.path.join(BASE_DIR, 'chrome_driver', 'chrome-win64', 'ch
 # TradingView URL
 TRADINGVIEW_SYMBOL_IDEAS_BASE_URL = "https://www.tradingview.com/symbols/{symbol}/ideas/"
 TIME_FILTER_SECONDS = 86400 # 1 ရက် (seconds)
-
-# --- Global Variables ---
-IS_CURRENTLY_SCRAPING = False # "သော့"
+MAX_CARDS_PER_PAGE = 30 # Page တစ်ခုမှာ စစ်မယ့် idea card အများဆုံး
+IDEA_DB_PATH = os.environ.get('IDEA_DB_PATH', os.path.join(BASE_DIR, 'ideas.db')) # Scrape ထားတဲ့ ideas သိမ်းမယ့် SQLite file
+# သိမ်းပြီးသား idea ဒီလောက် ဆက်တိုက် တွေ့မှ card parse ရပ် (Pinned/promoted card တစ်ခုကြောင့် idea အသစ်တွေ မလွတ်အောင်)
+KNOWN_LINK_STOP_STREAK = int(os.environ.get('KNOWN_LINK_STOP_STREAK', 3))
+
+# Scrape Engine: "auto" (HTTP အရင်၊ မရမှ Selenium) / "http" / "selenium"
+SCRAPE_ENGINE = os.environ.get('SCRAPE_ENGINE', 'auto').lower()
+HTTP_TIMEOUT_SECONDS = float(os.environ.get('HTTP_TIMEOUT_SECONDS', 15))
+HTTP_MAX_CONNECTIONS = int(os.environ.get('HTTP_MAX_CONNECTIONS', 20))
+# Driver Profile: "full" (page အပြည့်) / "lean" (eager load + ပုံ/font/media/third-party တွေ block)
+DRIVER_PROFILE = os.environ.get('DRIVER_PROFILE', 'full').lower()
+LEAN_BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico", # ပုံ (src attribute ကတော့ DOM ထဲမှာ ရှိနေဆဲ)
+    "*.woff", "*.woff2", "*.ttf", "*.otf", # Fonts
+    "*.mp4", "*.webm", "*.mp3", # Media
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*googlesyndication.com*",
+    "*facebook.net*", "*facebook.com*", "*twitter.com*", "*hotjar.com*", # Analytics / third-party
+    "*telemetry.tradingview.com*", "*pushstream.tradingview.com*", "*data.tradingview.com*", "*widgetdata.tradingview.com*", # Chart data / websockets
+]
+COOKIE_ACCEPT_SELECTOR = "button.tv-dialog__accept-button"
+
+# Card data ထုတ်ပုံ: "js" (execute_script တစ်ကြိမ်တည်းနဲ့ card အားလုံး) / "element" (card တစ်ခုချင်း WebDriver call)
+CARD_EXTRACTION_MODE = os.environ.get('CARD_EXTRACTION_MODE', 'js').lower()
+ELEMENT_ENRICH_CHUNK_SIZE = 5 # Per-element extraction မှာ ideas ဒီလောက်စီ စုပြီး enrich_ideas နဲ့ batch လုပ် (streaming မနှေးအောင် သေးသေး)
+HTTP_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36"
+
+# Driver Pool (Chrome ကို scrape တိုင်း အသစ်မဖွင့်ဘဲ ပြန်သုံး)
+DRIVER_POOL_SIZE = int(os.environ.get('DRIVER_POOL_SIZE', 2)) # ကြိုဖွင့်ထားမယ့် driver အရေအတွက်
+DRIVER_MAX_PAGE_LOADS = int(os.environ.get('DRIVER_MAX_PAGE_LOADS', 50)) # Page load ဒီလောက်ရောက်ရင် driver အသစ်လဲ
+DRIVER_MAX_RSS_MB = int(os.environ.get('DRIVER_MAX_RSS_MB', 1024)) # Chrome memory (MB) ဒီထက်ကျော်ရင် driver အသစ်လဲ
+
+# Symbol အများကြီးကို တစ်ပြိုင်နက် scrape လုပ်ခြင်း
+SCRAPE_CONCURRENCY = int(os.environ.get('SCRAPE_CONCURRENCY', DRIVER_POOL_SIZE)) # Scrape worker အရေအတွက် (တစ်ပြိုင်နက် run မယ့် scrape)
+SCRAPE_TIMEOUT_SECONDS = float(os.environ.get('SCRAPE_TIMEOUT_SECONDS', 120)) # Symbol တစ်ခုချင်းစီအတွက် timeout
+SCRAPE_QUEUE_MAX_SIZE = int(os.environ.get('SCRAPE_QUEUE_MAX_SIZE', 50)) # တန်းစီထားနိုင်တဲ့ symbol job အများဆုံး
+# Update (handler) တွေကို တစ်ပြိုင်နက် handle လုပ်မယ့် အရေအတွက် - /idea handler က scrape ပြီးအောင် await လုပ်လို့
+# 1 ဆို user တစ်ယောက်ရဲ့ /idea ပြီးမှ နောက်တစ်ယောက် dispatch ဖြစ်ပြီး scheduler queue / fairness / SCRAPE_CONCURRENCY အလကား ဖြစ်
+CONCURRENT_UPDATES = int(os.environ.get('CONCURRENT_UPDATES', 64))
+# Chrome scrape ကို ဘယ်မှာ run မလဲ: "thread" (bot process ထဲက thread) / "process" (worker process သီးသန့် - CPU core အများကြီး သုံးနိုင်)
+SCRAPER_MODE = os.environ.get('SCRAPER_MODE', 'thread').lower()
+SCRAPER_PROCESSES = int(os.environ.get('SCRAPER_PROCESSES', SCRAPE_CONCURRENCY)) # Worker process အရေအတွက် (တစ်ခုစီမှာ driver တစ်ခု)
+SCRAPER_PROCESS_MAX_JOBS = int(os.environ.get('SCRAPER_PROCESS_MAX_JOBS', 50)) # Job ဒီလောက်ပြီးရင် worker process အသစ်လဲ
+# Worker process job တစ်ခုလုံးအတွက် deadline - Scheduler က job ကို မစွန့်ခင် process ကို kill နိုင်အောင် SCRAPE_TIMEOUT_SECONDS ထက် နည်းနည်း နည်း
+# (auto engine ဆို HTTP fast path ကြာချိန်ပါ နုတ်)
+SCRAPER_PROCESS_JOB_TIMEOUT_SECONDS = float(os.environ.get('SCRAPER_PROCESS_JOB_TIMEOUT_SECONDS',
+    max(1.0, SCRAPE_TIMEOUT_SECONDS * 0.9 - (HTTP_TIMEOUT_SECONDS if SCRAPE_ENGINE == 'auto' else 0))))
+# Symbol အများကြီး request မှာ symbol အားလုံး ပြီးအောင် မစောင့်ဘဲ scrape ရလာသလို ideas တွေကို ချက်ချင်း ပို့ (0 ဆို ပိတ်)
+STREAM_DELIVERY = os.environ.get('STREAM_DELIVERY', '1') == '1'
+
+# Subscription (/subscribe) - subscriber ဘယ်နှယောက်ရှိရှိ symbol တစ်ခုကို interval တစ်ခါပဲ scrape
+SUBSCRIPTION_POLL_SECONDS = float(os.environ.get('SUBSCRIPTION_POLL_SECONDS', 300)) # Subscribe ထားတဲ့ symbol တွေကို စစ်မယ့် interval
+SUBSCRIPTION_MAX_SYMBOLS_PER_CHAT = int(os.environ.get('SUBSCRIPTION_MAX_SYMBOLS_PER_CHAT', 10)) # Chat တစ်ခု subscribe လုပ်နိုင်တဲ့ symbol အများဆုံး
+
+# Scrape result cache (Symbol တူ ခဏခဏ မ scrape ရအောင်)
+IDEA_CACHE_TTL_SECONDS = float(os.environ.get('IDEA_CACHE_TTL_SECONDS', 120)) # ဒီအချိန်အတွင်း fresh အဖြစ် သုံး
+IDEA_CACHE_STALE_SECONDS = float(os.environ.get('IDEA_CACHE_STALE_SECONDS', 900)) # ဒီအချိန်အထိ stale ကို ပြပြီး နောက်ကွယ်မှာ refresh
+IDEA_CACHE_MAX_ENTRIES = int(os.environ.get('IDEA_CACHE_MAX_ENTRIES', 200)) # LRU eviction မလုပ်ခင် symbol အများဆုံး
+
+# Bot ကို Telegram update လက်ခံပုံ: "polling" (getUpdates) / "webhook" (Telegram က local HTTP server ဆီ POST)
+BOT_MODE = os.environ.get('BOT_MODE', 'polling').lower()
+WEBHOOK_LISTEN = os.environ.get('WEBHOOK_LISTEN', '0.0.0.0')
+WEBHOOK_PORT = int(os.environ.get('WEBHOOK_PORT', 8443))
+WEBHOOK_PATH = os.environ.get('WEBHOOK_PATH', '/telegram') # Update POST လက်ခံမယ့် path (GET /healthz က load balancer အတွက်)
+WEBHOOK_URL = os.environ.get('WEBHOOK_URL', '') # Telegram ကို ပေးမယ့် public URL (ဥပမာ https://bot.example.com/telegram) - အလွတ်ဆို set_webhook မလုပ်
+WEBHOOK_SECRET_TOKEN = os.environ.get('WEBHOOK_SECRET_TOKEN', '') # X-Telegram-Bot-Api-Secret-Token header စစ်ဖို့
+WEBHOOK_MAX_BODY_BYTES = 1024 * 1024
+
+# Metrics (Prometheus-style endpoint - 0 ဆို ပိတ်)
+METRICS_HOST = os.environ.get('METRICS_HOST', '127.0.0.1')
+METRICS_PORT = int(os.environ.get('METRICS_PORT', 9100))
+
+# Telegram ပို့နှုန်း (Telegram limit: chat တစ်ခုကို ~1 msg/s၊ bot တစ်ခုလုံး ~30 msg/s)
+TELEGRAM_GLOBAL_RATE = float(os.environ.get('TELEGRAM_GLOBAL_RATE', 25)) # Bot တစ်ခုလုံး messages/second
+TELEGRAM_PER_CHAT_RATE = float(os.environ.get('TELEGRAM_PER_CHAT_RATE', 1)) # Chat တစ်ခုချင်း messages/second
+TELEGRAM_PER_CHAT_BURST = int(os.environ.get('TELEGRAM_PER_CHAT_BURST', 3)) # Chat တစ်ခုကို ဆက်တိုက် ပို့ခွင့်
+TELEGRAM_SEND_RETRIES = int(os.environ.get('TELEGRAM_SEND_RETRIES', 3)) # RetryAfter ရရင် ပြန်ကြိုးစားမယ့် အကြိမ်
+MEDIA_GROUP_MAX_SIZE = 10 # Telegram send_media_group တစ်ခါမှာ ပုံ အများဆုံး
+CAPTION_SUMMARY_MAX_CHARS = 300 # Caption ထဲ ထည့်မယ့် idea summary အရှည်
+
+# Chart ပုံ URL -> Telegram file_id cache (Telegram က ပုံကို ထပ်ခါ download မလုပ်ရအောင်)
+PHOTO_FILE_ID_CACHE_PATH = os.environ.get('PHOTO_FILE_ID_CACHE_PATH', os.path.join(BASE_DIR, 'photo_file_ids.json'))
+PHOTO_FILE_ID_CACHE_MAX_ENTRIES = int(os.environ.get('PHOTO_FILE_ID_CACHE_MAX_ENTRIES', 5000))
 
 # --- Logging Setup ---
 logging.basicConfig(
@@ -58,26 +151,500 @@ if os.name == 'nt':
     asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
 
 # --- Helper Functions (From RSS version - Likes/Position မပါ) ---
+WHITESPACE_RE = re.compile(r'\s+')
+
+class _TextExtractor(HTMLParser):
+    """Tag တွေ ဖယ်ပြီး text ပဲ စုမယ့် parser (BeautifulSoup tree မဆောက်ဘဲ thread တစ်ခုချင်း ပြန်သုံး)"""
+
+    SKIP_TAGS = {'script', 'style'}
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self._parts = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS: self._skip_depth += 1
+        else: self._parts.append(" ") # <br>, <p> စတာတွေ စကားလုံး မကပ်အောင်
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS: self._skip_depth = max(0, self._skip_depth - 1)
+        else: self._parts.append(" ")
+
+    def handle_data(self, data):
+        if not self._skip_depth: self._parts.append(data)
+
+    def extract(self, raw_html):
+        self.reset()
+        self._parts.clear()
+        self._skip_depth = 0
+        self.feed(raw_html)
+        self.close()
+        return "".join(self._parts)
+
+
+_TEXT_EXTRACTOR = threading.local()
+
 def clean_html(raw_html):
     """HTML tags တွေကို ဖယ်ရှားပြီး text ကို ရှင်းလင်း"""
     if not raw_html: return ""
+    if '<' not in raw_html: # Tag မပါရင် parser မလို
+        return WHITESPACE_RE.sub(' ', html.unescape(raw_html)).strip()
+    extractor = getattr(_TEXT_EXTRACTOR, 'parser', None)
+    if extractor is None:
+        extractor = _TEXT_EXTRACTOR.parser = _TextExtractor()
     try:
-        soup = BeautifulSoup(raw_html, "html.parser")
-        text = soup.get_text(separator=" ")
-        text = re.sub(r'\s+', ' ', text).strip()
-        return text
+        return WHITESPACE_RE.sub(' ', extractor.extract(raw_html)).strip()
     except Exception: return raw_html
 
+# Keyword တွေကို စကားလုံး အပြည့်နဲ့ပဲ ရှာ ("support" ထဲက "up" လို substring တွေ မပါ) - Alternation တစ်ခုတည်းနဲ့ text ကို တစ်ခေါက်ပဲ scan
+LONG_KEYWORDS = ['long', 'longs', 'bull', 'bulls', 'bullish', 'buy', 'buying', 'up', 'uptrend', 'bounce', 'bounced',
+                 'rally', 'rallies', 'breakout', 'target', 'targets', 'support']
+SHORT_KEYWORDS = ['short', 'shorts', 'bear', 'bears', 'bearish', 'sell', 'selling', 'down', 'downtrend', 'reject',
+                  'rejected', 'rejection', 'drop', 'breakdown', 'resistance']
+POSITION_KEYWORD_RE = re.compile(
+    r'\b(?:(?P<long>' + '|'.join(sorted(LONG_KEYWORDS, key=len, reverse=True)) + r')'
+    r'|(?P<short>' + '|'.join(sorted(SHORT_KEYWORDS, key=len, reverse=True)) + r'))\b',
+    re.IGNORECASE,
+)
+
 def infer_position(title, summary):
-    """Title နဲ့ Summary ထဲက keywords တွေ ကြည့်ပြီး Long/Short ခန့်မှန်း"""
-    # Selenium ကနေ တိုက်ရိုက် Position ယူမှာမို့ ဒီ function ကို အရင်လိုပဲ ထားခဲ့နိုင်
-    text_lower = (title + " " + summary).lower()
-    is_long = any(word in text_lower for word in ['long', 'bull', 'buy', 'up', 'bounce', 'rally', 'breakout', 'target', 'support'])
-    is_short = any(word in text_lower for word in ['short', 'bear', 'sell', 'down', 'reject', 'drop', 'breakdown', 'resistance'])
-    if is_long and not is_short: return "Long", "🟢"
-    elif is_short and not is_long: return "Short", "🔴"
+    """Title နဲ့ Summary ထဲက keywords တွေ ကြည့်ပြီး Long/Short ခန့်မှန်း (Strategy icon မပါတဲ့ card အတွက်)"""
+    found = set()
+    for match in POSITION_KEYWORD_RE.finditer(f"{title or ''} {summary or ''}"):
+        found.add(match.lastgroup)
+        if len(found) == 2: break # နှစ်ဖက်လုံး တွေ့ရင် Unknown - ဆက်ရှာစရာ မလို
+    if found == {'long'}: return "Long", "🟢"
+    elif found == {'short'}: return "Short", "🔴"
     else: return "Unknown", "⚪️"
 
+def enrich_ideas(ideas):
+    """Scrape ရလာတဲ့ idea list တစ်ခုလုံးကို တစ်ခါတည်း enrich (in place)
+
+    Summary ကို text သန့်အဖြစ် ပြောင်းပြီး strategy icon မပါတဲ့ (type "Unknown") idea တွေကို title/summary ကနေ Long/Short ခန့်မှန်း။
+    """
+    inferred = 0
+    for idea in ideas:
+        summary = idea['summary'] = clean_html(idea.get('summary'))
+        if idea.get('type', 'Unknown') == 'Unknown':
+            idea['type'], idea['position_emoji'] = infer_position(idea.get('title'), summary)
+            inferred += idea['type'] != 'Unknown'
+    if inferred: METRICS.inc("positions_inferred_total", inferred)
+    return ideas
+
+# -----------------------------------------------------------------
+# --- Metrics (Stage timing histograms + counters) ---
+# -----------------------------------------------------------------
+class Metrics:
+    """Scraper thread တွေကနေပါ ခေါ်လို့ရတဲ့ thread-safe histogram / counter / gauge registry"""
+
+    BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+    PREFIX = "tradingideas_"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {} # (name, labels) -> value
+        self._histograms = {} # (name, labels) -> [bucket_counts, sum, count]
+        self._gauges = {} # name -> callable
+        self._help = {}
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted(labels.items()))
+
+    def inc(self, name, amount=1, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name, seconds, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            histogram = self._histograms.setdefault(key, [[0] * len(self.BUCKETS), 0.0, 0])
+            for i, bound in enumerate(self.BUCKETS):
+                if seconds <= bound: histogram[0][i] += 1
+            histogram[1] += seconds
+            histogram[2] += 1
+
+    @contextmanager
+    def timer(self, name, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def drain(self):
+        """Counter / histogram တွေကို ထုတ်ယူပြီး reset (Worker process က parent ဆီ ပို့ဖို့)"""
+        with self._lock:
+            snapshot = (self._counters, self._histograms)
+            self._counters, self._histograms = {}, {}
+        return snapshot
+
+    def merge(self, snapshot):
+        """drain() က snapshot (worker process ရဲ့ metrics) ကို ဒီ registry ထဲ ပေါင်းထည့်"""
+        counters, histograms = snapshot
+        with self._lock:
+            for key, value in counters.items():
+                self._counters[key] = self._counters.get(key, 0) + value
+            for key, (buckets, total, count) in histograms.items():
+                histogram = self._histograms.setdefault(key, [[0] * len(self.BUCKETS), 0.0, 0])
+                histogram[0] = [a + b for a, b in zip(histogram[0], buckets)]
+                histogram[1] += total
+                histogram[2] += count
+
+    def gauge(self, name, func):
+        """Scrape လုပ်ချိန်မှာ func() ခေါ်ပြီး တန်ဖိုးယူမယ့် gauge"""
+        self._gauges[name] = func
+
+    @staticmethod
+    def _labels_text(labels, extra=()):
+        pairs = list(labels) + list(extra)
+        if not pairs: return ""
+        return "{" + ",".join(f'{k}="{str(v)}"' for k, v in pairs) + "}"
+
+    def render_prometheus(self):
+        """Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted((key, (list(h[0]), h[1], h[2])) for key, h in self._histograms.items())
+        for (name, labels), value in counters:
+            lines.append(f"{self.PREFIX}{name}{self._labels_text(labels)} {value}")
+        for (name, labels), (buckets, total, count) in histograms:
+            for bound, bucket_count in zip(self.BUCKETS, buckets):
+                lines.append(f"{self.PREFIX}{name}_bucket{self._labels_text(labels, [('le', bound)])} {bucket_count}")
+            lines.append(f"{self.PREFIX}{name}_bucket{self._labels_text(labels, [('le', '+Inf')])} {count}")
+            lines.append(f"{self.PREFIX}{name}_sum{self._labels_text(labels)} {total:.6f}")
+            lines.append(f"{self.PREFIX}{name}_count{self._labels_text(labels)} {count}")
+        for name, func in sorted(self._gauges.items()):
+            try:
+                lines.append(f"{self.PREFIX}{name} {func()}")
+            except Exception as e:
+                logger.warning(f"Metrics gauge {name} failed: {e}")
+        return "\n".join(lines) + "\n"
+
+    def summary_text(self):
+        """/stats အတွက် stage တစ်ခုချင်း count / avg နဲ့ counter တွေကို စာသားအဖြစ်"""
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted((key, (h[1], h[2])) for key, h in self._histograms.items())
+        lines = ["Stage timings (count / avg):"]
+        for (name, labels), (total, count) in histograms:
+            label_text = ",".join(f"{k}={v}" for k, v in labels)
+            lines.append(f"  {name}[{label_text}]: {count} / {total / count:.2f}s")
+        lines.append("Counters:")
+        for (name, labels), value in counters:
+            label_text = ",".join(f"{k}={v}" for k, v in labels)
+            lines.append(f"  {name}[{label_text}]: {value}")
+        lines.append("Gauges:")
+        for name, func in sorted(self._gauges.items()):
+            try: lines.append(f"  {name}: {func()}")
+            except Exception: pass
+        return "\n".join(lines)
+
+
+METRICS = Metrics()
+
+
+async def handle_metrics_request(reader, writer):
+    """GET /metrics ကို Prometheus text နဲ့ ပြန်ဖြေမယ့် အသေးစား HTTP handler"""
+    try:
+        request_line = await asyncio.wait_for(reader.readline(), 5)
+        while (await asyncio.wait_for(reader.readline(), 5)) not in (b"\r\n", b"\n", b""): pass # Headers ကျော်
+        parts = request_line.decode('latin-1').split()
+        if len(parts) >= 2 and parts[0] == 'GET' and parts[1].split('?')[0] == '/metrics':
+            status, body = "200 OK", METRICS.render_prometheus().encode()
+        else:
+            status, body = "404 Not Found", b"not found\n"
+        writer.write(f"HTTP/1.1 {status}\r\nContent-Type: text/plain; version=0.0.4\r\n"
+                     f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+        await writer.drain()
+    except (asyncio.TimeoutError, ConnectionError) as e:
+        logger.debug(f"Metrics request failed: {e}")
+    finally:
+        writer.close()
+
+
+async def start_metrics_server():
+    if not METRICS_PORT: return None
+    server = await asyncio.start_server(handle_metrics_request, METRICS_HOST, METRICS_PORT)
+    logger.info(f"Metrics endpoint listening on http://{METRICS_HOST}:{METRICS_PORT}/metrics")
+    return server
+
+# --- Card Parsing Helpers (Selenium / HTTP engine နှစ်ခုလုံး မျှသုံး) ---
+def parse_likes_text(likes_str):
+    """Like button စာသား ("12", "1.2K") ကို integer ပြောင်း"""
+    likes_str = (likes_str or "").strip()
+    try:
+        if 'K' in likes_str: return int(float(likes_str.replace('K', '')) * 1000)
+        elif likes_str.isdigit(): return int(likes_str)
+    except ValueError: pass
+    return 0
+
+def parse_card_timestamp(dt_str, default_ts):
+    """<time datetime="..."> ကို unix timestamp ပြောင်း (မရရင် default)"""
+    try:
+        return datetime.fromisoformat(dt_str.replace('Z', '+00:00')).timestamp()
+    except (AttributeError, TypeError, ValueError):
+        return default_ts
+
+def strategy_to_position(idea_type_str):
+    """Strategy icon title ("Long"/"Short") ကို (type, emoji) ပြောင်း"""
+    if idea_type_str == 'Long': return 'Long', '🟢'
+    elif idea_type_str == 'Short': return 'Short', '🔴'
+    return 'Unknown', '⚪️'
+
+def normalize_image_url(image_url):
+    if image_url and image_url.startswith('/'):
+        image_url = "https://www.tradingview.com" + image_url
+    if image_url and not image_url.startswith('http'):
+        image_url = None # Invalid image URL
+    return image_url
+
+def ideas_from_raw_cards(raw_cards, symbol, known_links=None, engine="selenium"):
+    """Raw card dict list (title, link, datetime, image_src, strategy, likes_text, summary) ကို idea dict list ပြောင်း
+
+    ၂၄ နာရီထက် ဟောင်းတာတွေ ဖယ်ပြီး enrich_ideas နဲ့ batch တစ်ခုလုံး enrich လုပ်ကာ နောက်ဆုံး idea အရင် စီပေးမယ်။
+    known_links ထဲက link (သိမ်းပြီးသား idea) တွေကို ကျော်ပြီး KNOWN_LINK_STOP_STREAK ခု ဆက်တိုက် တွေ့ရင် ရပ်မယ်။
+    Title / link မပါတဲ့ card တွေကို cards_skipped_total (engine label) မှာ ရေတွက်မယ်။
+    """
+    now_ts = time.time()
+    time_limit_ts = now_ts - TIME_FILTER_SECONDS
+    scraped_ideas = []
+    known_streak = 0
+    for card in raw_cards[:MAX_CARDS_PER_PAGE]:
+        title, full_link = card.get('title'), card.get('link')
+        if not title or not full_link:
+            METRICS.inc("cards_skipped_total", reason="missing_element", engine=engine)
+            continue
+        if known_links and full_link in known_links:
+            known_streak += 1
+            if known_streak >= KNOWN_LINK_STOP_STREAK:
+                logger.debug(f"Reached {known_streak} already stored ideas in a row for {symbol.upper()}. Stopping: {title}")
+                break
+            continue
+        known_streak = 0
+        timestamp = parse_card_timestamp(card.get('datetime'), now_ts)
+        if timestamp < time_limit_ts:
+            logger.debug(f"Idea older than 24h skipped: {title}")
+            continue
+        idea_type, position_emoji = strategy_to_position(card.get('strategy'))
+        scraped_ideas.append({
+            'title': title, 'symbol': symbol.upper(), 'type': idea_type,
+            'position_emoji': position_emoji,
+            'likes_count': parse_likes_text(card.get('likes_text')),
+            'published_time': timestamp,
+            'image_url': normalize_image_url(card.get('image_src')), 'full_link': full_link,
+            'summary': card.get('summary'),
+        })
+    enrich_ideas(scraped_ideas)
+    scraped_ideas.sort(key=lambda x: x['published_time'], reverse=True)
+    return scraped_ideas
+
+# -----------------------------------------------------------------
+# --- SQLite Idea Store (Restart ဖြစ်လည်း history မပျောက် + Incremental scrape) ---
+# -----------------------------------------------------------------
+class IdeaStore:
+    """Scrape လုပ်ထားတဲ့ ideas ကို full_link unique key နဲ့ SQLite (WAL mode) ထဲမှာ သိမ်း"""
+
+    IDEA_COLUMNS = ('full_link', 'symbol', 'title', 'type', 'position_emoji', 'likes_count', 'published_time', 'image_url', 'summary')
+    # Idea တစ်ခုက symbol နာမည် တစ်ခုထက်ပိုအောက်မှာ ပေါ်နိုင် (ဥပမာ BTCUSDT / BINANCE:BTCUSDT) - symbol တစ်ခုချင်းစီအတွက် row သီးသန့်
+    IDEAS_TABLE_SQL = """CREATE TABLE IF NOT EXISTS {name} (
+                full_link TEXT NOT NULL,
+                symbol TEXT NOT NULL,
+                title TEXT NOT NULL,
+                type TEXT NOT NULL,
+                position_emoji TEXT NOT NULL,
+                likes_count INTEGER NOT NULL DEFAULT 0,
+                published_time REAL NOT NULL,
+                image_url TEXT,
+                scraped_at REAL NOT NULL,
+                summary TEXT,
+                PRIMARY KEY (symbol, full_link)
+            )"""
+    NOTIFIED_TABLE_SQL = """CREATE TABLE IF NOT EXISTS {name} (
+                symbol TEXT NOT NULL,
+                full_link TEXT NOT NULL,
+                notified_at REAL NOT NULL,
+                PRIMARY KEY (symbol, full_link)
+            )"""
+
+    def __init__(self, path=IDEA_DB_PATH):
+        self.path = path
+        self._conn = None
+        self._lock = threading.Lock() # Scraper thread တွေကနေ connection တစ်ခုတည်းကို မျှသုံး
+
+    def _connection(self):
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(self.IDEAS_TABLE_SQL.format(name='ideas'))
+            if 'summary' not in {row['name'] for row in conn.execute("PRAGMA table_info(ideas)")}:
+                conn.execute("ALTER TABLE ideas ADD COLUMN summary TEXT") # Summary column မပါခင် ဆောက်ခဲ့တဲ့ DB
+            if [row['name'] for row in conn.execute("PRAGMA table_info(ideas)") if row['pk']] == ['full_link']:
+                # full_link တစ်ခုတည်း primary key ဖြစ်ခဲ့တဲ့ DB ဟောင်း - SQLite မှာ PK ပြောင်းလို့မရလို့ table ပြန်ဆောက်
+                columns = ", ".join(self.IDEA_COLUMNS + ('scraped_at',))
+                conn.execute(self.IDEAS_TABLE_SQL.format(name='ideas_by_symbol'))
+                conn.execute(f"INSERT INTO ideas_by_symbol ({columns}) SELECT {columns} FROM ideas")
+                conn.execute("DROP TABLE ideas")
+                conn.execute("ALTER TABLE ideas_by_symbol RENAME TO ideas")
+                logger.info("Migrated the ideas table to a (symbol, full_link) primary key.")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_ideas_symbol_published ON ideas (symbol, published_time)")
+            conn.execute("""CREATE TABLE IF NOT EXISTS subscriptions (
+                chat_id INTEGER NOT NULL,
+                symbol TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (chat_id, symbol)
+            )""")
+            conn.execute(self.NOTIFIED_TABLE_SQL.format(name='notified_ideas'))
+            if [row['name'] for row in conn.execute("PRAGMA table_info(notified_ideas)") if row['pk']] == ['full_link']:
+                # Symbol နှစ်ခုအောက်မှာ ပေါ်တဲ့ idea က symbol တစ်ခုဆီပဲ မှတ်မိနေတဲ့ DB ဟောင်း - ideas table လိုပဲ ပြန်ဆောက်
+                conn.execute(self.NOTIFIED_TABLE_SQL.format(name='notified_ideas_by_symbol'))
+                conn.execute("INSERT INTO notified_ideas_by_symbol (symbol, full_link, notified_at) "
+                             "SELECT symbol, full_link, notified_at FROM notified_ideas")
+                conn.execute("DROP TABLE notified_ideas")
+                conn.execute("ALTER TABLE notified_ideas_by_symbol RENAME TO notified_ideas")
+                logger.info("Migrated the notified_ideas table to a (symbol, full_link) primary key.")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_notified_ideas_symbol ON notified_ideas (symbol, notified_at)")
+            conn.execute("""CREATE TABLE IF NOT EXISTS chat_notified_ideas (
+                chat_id INTEGER NOT NULL,
+                full_link TEXT NOT NULL,
+                notified_at REAL NOT NULL,
+                PRIMARY KEY (chat_id, full_link)
+            )""")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def known_links(self, symbol, since_ts):
+        """Symbol အတွက် since_ts နောက်ပိုင်း သိမ်းပြီးသား idea link တွေ"""
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT full_link FROM ideas WHERE symbol = ? AND published_time >= ?", (symbol.upper(), since_ts)
+            ).fetchall()
+        return {row['full_link'] for row in rows}
+
+    def save_ideas(self, ideas):
+        """Ideas အသစ်တွေ ထည့် (link တူရင် title/type/likes/image/summary ကို update)"""
+        if not ideas: return
+        now_ts = time.time()
+        rows = [tuple(idea.get(column) for column in self.IDEA_COLUMNS) + (now_ts,) for idea in ideas]
+        with self._lock:
+            conn = self._connection()
+            conn.executemany(
+                """INSERT INTO ideas (full_link, symbol, title, type, position_emoji, likes_count, published_time, image_url, summary, scraped_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(symbol, full_link) DO UPDATE SET
+                       title = excluded.title, type = excluded.type, position_emoji = excluded.position_emoji,
+                       likes_count = excluded.likes_count,
+                       image_url = excluded.image_url, summary = excluded.summary, scraped_at = excluded.scraped_at""",
+                rows,
+            )
+            conn.commit()
+
+    def recent_ideas(self, symbols, since_ts=None):
+        """Symbol တွေရဲ့ since_ts (default: နောက်ဆုံး ၂၄ နာရီ) နောက်ပိုင်း ideas ကို နောက်ဆုံး အရင် ပြန် (Symbol နှစ်ခုအောက်မှာ ပါတဲ့ idea ကို တစ်ခါပဲ)"""
+        symbols = [symbol.upper() for symbol in symbols]
+        if not symbols: return []
+        if since_ts is None: since_ts = time.time() - TIME_FILTER_SECONDS
+        placeholders = ",".join("?" * len(symbols))
+        with self._lock:
+            rows = self._connection().execute(
+                f"SELECT {', '.join(self.IDEA_COLUMNS)} FROM ideas "
+                f"WHERE symbol IN ({placeholders}) AND published_time >= ? ORDER BY published_time DESC",
+                (*symbols, since_ts),
+            ).fetchall()
+        ideas = {}
+        for row in rows:
+            ideas.setdefault(row['full_link'], dict(row))
+        return list(ideas.values())
+
+    def add_subscription(self, chat_id, symbol):
+        """Chat ကို symbol မှာ subscribe လုပ် (အသစ်ဆို True)"""
+        with self._lock:
+            conn = self._connection()
+            cursor = conn.execute("INSERT OR IGNORE INTO subscriptions (chat_id, symbol, created_at) VALUES (?, ?, ?)",
+                                  (chat_id, symbol.upper(), time.time()))
+            conn.commit()
+        return cursor.rowcount > 0
+
+    def remove_subscriptions(self, chat_id, symbols=None):
+        """Chat ရဲ့ subscription တွေ ဖျက် (symbols မပေးရင် အားလုံး)၊ ဖျက်လိုက်တဲ့ symbol တွေ ပြန်"""
+        wanted = None if symbols is None else {symbol.upper() for symbol in symbols}
+        removed = [symbol for symbol in self.subscriptions(chat_id) if wanted is None or symbol in wanted]
+        with self._lock:
+            conn = self._connection()
+            conn.executemany("DELETE FROM subscriptions WHERE chat_id = ? AND symbol = ?", [(chat_id, symbol) for symbol in removed])
+            conn.commit()
+        return removed
+
+    def subscriptions(self, chat_id):
+        """Chat တစ်ခု subscribe လုပ်ထားတဲ့ symbol တွေ"""
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT symbol FROM subscriptions WHERE chat_id = ? ORDER BY created_at", (chat_id,)
+            ).fetchall()
+        return [row['symbol'] for row in rows]
+
+    def subscribers_by_symbol(self):
+        """{symbol: [chat_id, ...]} - Poller က symbol တစ်ခုကို တစ်ခါပဲ scrape ဖို့"""
+        with self._lock:
+            rows = self._connection().execute("SELECT symbol, chat_id FROM subscriptions ORDER BY symbol, created_at").fetchall()
+        subscribers = {}
+        for row in rows:
+            subscribers.setdefault(row['symbol'], []).append(row['chat_id'])
+        return subscribers
+
+    def notified_links(self, symbol, since_ts):
+        """Subscriber တွေဆီ ပို့ပြီးသား (သို့) baseline အဖြစ် မှတ်ထားပြီးသား idea link တွေ"""
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT full_link FROM notified_ideas WHERE symbol = ? AND notified_at >= ?", (symbol.upper(), since_ts)
+            ).fetchall()
+        return {row['full_link'] for row in rows}
+
+    def mark_notified(self, symbol, links):
+        """Idea link တွေကို ပို့ပြီးသား အဖြစ် မှတ်ပြီး ၂၄ နာရီ ကျော်တဲ့ မှတ်တမ်းဟောင်းတွေ ဖယ်"""
+        now_ts = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.executemany("INSERT OR REPLACE INTO notified_ideas (full_link, symbol, notified_at) VALUES (?, ?, ?)",
+                             [(link, symbol.upper(), now_ts) for link in links])
+            conn.execute("DELETE FROM notified_ideas WHERE notified_at < ?", (now_ts - 2 * TIME_FILTER_SECONDS,))
+            conn.execute("DELETE FROM chat_notified_ideas WHERE notified_at < ?", (now_ts - 2 * TIME_FILTER_SECONDS,))
+            conn.commit()
+
+    def chat_notified_links(self, chat_id, links):
+        """links ထဲက chat တစ်ခုဆီ ပို့ပြီးသား link တွေ (Subscriber တချို့ဆီ ပို့မရခဲ့တဲ့ idea ကို ပြန်ပို့ရင် ကျန်တဲ့ chat တွေ ထပ်မရအောင်)"""
+        if not links: return set()
+        with self._lock:
+            rows = self._connection().execute(
+                f"SELECT full_link FROM chat_notified_ideas WHERE chat_id = ? AND full_link IN ({','.join('?' * len(links))})",
+                (chat_id, *links),
+            ).fetchall()
+        return {row['full_link'] for row in rows}
+
+    def mark_chat_notified(self, chat_id, links):
+        """Idea link တွေကို chat တစ်ခုဆီ ပို့ပြီးသား အဖြစ် မှတ်"""
+        now_ts = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.executemany("INSERT OR REPLACE INTO chat_notified_ideas (chat_id, full_link, notified_at) VALUES (?, ?, ?)",
+                             [(chat_id, link, now_ts) for link in links])
+            conn.commit()
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+IDEA_STORE = IdeaStore()
+
 # -----------------------------------------------------------------
 # --- Selenium Scraper Function (ပြန်လည် အသုံးပြု) ---
 # -----------------------------------------------------------------
@@ -89,7 +656,19 @@ def setup_selenium_driver():
     chrome_options.add_argument("--disable-dev-shm-usage")
     chrome_options.add_argument("--disable-gpu")
     chrome_options.add_argument("--window-size=1920x1080") # Needed for some sites in headless
-    chrome_options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36") # Stable UA
+    chrome_options.add_argument(f"user-agent={HTTP_USER_AGENT}") # Stable UA
+
+    if DRIVER_PROFILE == 'lean':
+        chrome_options.page_load_strategy = 'eager' # DOMContentLoaded ရောက်တာနဲ့ driver.get ပြီး
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        chrome_options.add_argument("--disable-extensions")
+        chrome_options.add_argument("--disable-background-networking")
+        chrome_options.add_argument("--mute-audio")
+        chrome_options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.notifications": 2,
+            "profile.default_content_setting_values.media_stream": 2,
+        })
 
     # Render Environment Check (Buildpack က Chrome/Driver ထည့်ပေးတတ်တယ်)
     # RENDER environment variable ရှိမရှိ စစ်ဆေး
@@ -103,7 +682,7 @@ def setup_selenium_driver():
             # Service object မလိုဘဲ တိုက်ရိုက် ခေါ်ကြည့်မယ်
             driver = webdriver.Chrome(options=chrome_options)
             logger.info("Selenium driver initialized using Render's default paths.")
-            return driver
+            return apply_driver_profile(driver)
         except Exception as e:
             logger.error(f"Failed to initialize driver on Render with default paths: {e}")
             # Fallback to trying specific paths if needed, or raise error
@@ -123,78 +702,305 @@ def setup_selenium_driver():
         try:
             driver = webdriver.Chrome(service=service, options=chrome_options)
             logger.info("Selenium driver initialized using local paths.")
-            return driver
+            return apply_driver_profile(driver)
         except Exception as e:
             logger.error(f"Failed to initialize driver on local machine: {e}")
             raise e
 
+def apply_driver_profile(driver):
+    """Lean profile ဆိုရင် CDP နဲ့ မလိုတဲ့ URL တွေကို network အဆင့်မှာ block"""
+    if DRIVER_PROFILE != 'lean': return driver
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": LEAN_BLOCKED_URL_PATTERNS})
+        logger.info(f"Lean driver profile applied ({len(LEAN_BLOCKED_URL_PATTERNS)} URL patterns blocked).")
+    except Exception as e:
+        logger.warning(f"Could not apply CDP URL blocking for lean profile: {e}")
+    return driver
+
+# -----------------------------------------------------------------
+# --- Warm Driver Pool (Chrome cold start ကို ရှောင်) ---
+# -----------------------------------------------------------------
+def _process_tree_rss_mb(pid):
+    """Process နဲ့ သူ့ child process တွေရဲ့ RSS (MB) ကို /proc ကနေ ပေါင်းတွက် (Linux only, မရရင် None)"""
+    total_kb = 0
+    pending = [pid]
+    try:
+        while pending:
+            current = pending.pop()
+            with open(f"/proc/{current}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total_kb += int(line.split()[1])
+                        break
+            for task in os.listdir(f"/proc/{current}/task"):
+                try:
+                    with open(f"/proc/{current}/task/{task}/children") as f:
+                        pending.extend(int(child) for child in f.read().split())
+                except OSError: pass
+    except (OSError, ValueError):
+        return None
+    return total_kb / 1024
+
+
+class DriverUnavailableError(Exception):
+    """Pool ထဲမှာ driver မရှိ၊ အသစ်လည်း ဖွင့်မရ"""
+
+
+class DriverPool:
+    """Headless Chrome driver တွေကို ကြိုဖွင့်ထားပြီး checkout/return လုပ်သုံးမယ့် pool"""
 
-def fetch_ideas_selenium(symbol: str): # <-- Function name ပြောင်းထား
-    """Specific symbol အတွက် TradingView Ideas page ကို Selenium ဖြင့် Scrape လုပ်မယ်"""
+    def __init__(self, size=DRIVER_POOL_SIZE, max_page_loads=DRIVER_MAX_PAGE_LOADS, max_rss_mb=DRIVER_MAX_RSS_MB):
+        self.size = size
+        self.max_page_loads = max_page_loads
+        self.max_rss_mb = max_rss_mb
+        self._idle = [] # [(driver, page_loads), ...]
+        self._page_loads = {} # id(driver) -> page load အရေအတွက် (pool ထဲက driver တွေအတွက်)
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def warm_up(self):
+        """Pool size ပြည့်အောင် driver တွေ ကြိုဖွင့်ထား (Blocking - thread ထဲကနေ ခေါ်ပါ)"""
+        while True:
+            with self._lock:
+                if self._closed or len(self._idle) >= self.size: return
+            try:
+                driver = setup_selenium_driver()
+            except Exception as e:
+                logger.error(f"Driver pool warm-up failed: {e}")
+                return
+            if driver is None:
+                logger.error("Driver pool warm-up failed: driver setup returned None.")
+                return
+            with self._lock:
+                if self._closed or len(self._idle) >= self.size:
+                    self._quit(driver)
+                    return
+                self._idle.append((driver, 0))
+                logger.info(f"Driver pool warmed: {len(self._idle)}/{self.size} drivers ready.")
+
+    def acquire(self):
+        """Idle driver တစ်ခု ထုတ်ပေး။ Health check မအောင်တာတွေ ဖယ်ပြီး pool ကုန်နေရင် None ပြန်"""
+        while True:
+            with self._lock:
+                if self._closed or not self._idle: return None
+                driver, page_loads = self._idle.pop()
+                self._page_loads[id(driver)] = page_loads
+            if self._is_healthy(driver):
+                logger.info(f"Driver checked out from pool (page loads: {page_loads}).")
+                return driver
+            logger.warning("Pooled driver failed health check. Discarding it.")
+            self._discard(driver)
+
+    def release(self, driver, discard=False):
+        """Scrape ပြီးတဲ့ driver ကို pool ထဲ ပြန်ထည့် (သို့) recycle လုပ်"""
+        with self._lock:
+            page_loads = self._page_loads.pop(id(driver), 0) + 1
+        if discard or self._needs_recycle(driver, page_loads):
+            self._quit(driver)
+            return
+        with self._lock:
+            if not self._closed and len(self._idle) < self.size:
+                self._idle.append((driver, page_loads))
+                return
+        self._quit(driver) # Pool ပြည့်နေရင် (fallback driver) ပိတ်လိုက်
+
+    def shutdown(self):
+        """Pool ထဲက driver အားလုံးကို ပိတ်"""
+        with self._lock:
+            self._closed = True
+            drivers = [driver for driver, _ in self._idle]
+            self._idle.clear()
+        for driver in drivers:
+            self._quit(driver)
+        logger.info(f"Driver pool shut down ({len(drivers)} drivers quit).")
+
+    def _needs_recycle(self, driver, page_loads):
+        if page_loads >= self.max_page_loads:
+            logger.info(f"Recycling driver after {page_loads} page loads.")
+            return True
+        rss_mb = self._driver_rss_mb(driver)
+        if rss_mb is not None and rss_mb >= self.max_rss_mb:
+            logger.info(f"Recycling driver using {rss_mb:.0f} MB (limit {self.max_rss_mb} MB).")
+            return True
+        return False
+
+    def _discard(self, driver):
+        with self._lock:
+            self._page_loads.pop(id(driver), None)
+        self._quit(driver)
+
+    @staticmethod
+    def _is_healthy(driver):
+        try:
+            driver.current_url # Chrome/chromedriver အသက်ရှင်မရှင် စစ်
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _driver_rss_mb(driver):
+        try:
+            pid = driver.service.process.pid
+        except AttributeError:
+            return None
+        return _process_tree_rss_mb(pid)
+
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.warning(f"Error while quitting Chrome driver: {e}")
+
+
+DRIVER_POOL = DriverPool()
+
+
+# Browser ထဲမှာ card အားလုံးကို တစ်ခါတည်း ဖတ်ပြီး {cards: raw card list (ideas_from_raw_cards format), skipped: ကျော်ခဲ့တဲ့ card အရေအတွက်} ပြန်ပေးမယ့် script
+EXTRACT_CARDS_JS = """
+const maxCards = arguments[0];
+const cards = [];
+let skipped = 0;
+for (const card of Array.from(document.querySelectorAll('article')).slice(0, maxCards)) {
+    const titleEl = card.querySelector('a.title-tkslJwxl');
+    const imageEl = card.querySelector('img.image-gDIex6UB');
+    if (!titleEl || !imageEl) { skipped++; continue; }
+    const timeEl = card.querySelector('time');
+    const typeEl = card.querySelector('span.idea-strategy-icon-wrap-cbI7LT3N');
+    const likesEl = card.querySelector('button[data-qa-id="ui-lib-card-like-button"]');
+    const summaryEl = card.querySelector('p.paragraph-t3qFZvNN');
+    cards.push({
+        title: (titleEl.innerText || '').trim() || titleEl.getAttribute('title'),
+        link: titleEl.href,
+        datetime: timeEl ? timeEl.getAttribute('datetime') : null,
+        image_src: imageEl.getAttribute('src') || imageEl.getAttribute('data-src'),
+        strategy: typeEl ? typeEl.getAttribute('title') : null,
+        likes_text: likesEl ? (likesEl.innerText || '').trim() : '',
+        summary: summaryEl ? summaryEl.innerHTML : ''
+    });
+}
+return {cards: cards, skipped: skipped};
+"""
+
+def extract_raw_cards_js(driver):
+    """EXTRACT_CARDS_JS ကို round trip တစ်ကြိမ်တည်းနဲ့ run (မအောင်မြင်ရင် None - per-element fallback အတွက်)"""
+    try:
+        result = driver.execute_script(EXTRACT_CARDS_JS, MAX_CARDS_PER_PAGE)
+    except Exception as e:
+        logger.warning(f"Bulk JS card extraction failed: {e}")
+        return None
+    if not isinstance(result, dict) or not isinstance(result.get('cards'), list):
+        logger.warning(f"Bulk JS card extraction returned {type(result).__name__}, expected {{cards, skipped}}.")
+        return None
+    skipped = result.get('skipped') or 0
+    if skipped: # Selenium per-element path / HTTP path နဲ့ counter တူ
+        METRICS.inc("cards_skipped_total", skipped, reason="missing_element", engine="selenium")
+    return result['cards']
+
+
+def iter_ideas_selenium(symbol: str, known_links=None):
+    """Specific symbol အတွက် TradingView Ideas page ကို Selenium ဖြင့် Scrape လုပ်ပြီး idea တွေကို parse လုပ်ရင်း တစ်ခုချင်း yield
+
+    Page ပေါ်က အစဉ်အတိုင်း yield မယ် (မစီရသေး)။ Scrape မအောင်မြင်ရင် exception တက်မယ်။
+    known_links ပေးထားရင် သိမ်းပြီးသား idea တွေကို ကျော်ပြီး KNOWN_LINK_STOP_STREAK ခု ဆက်တိုက် တွေ့ရင် card parse လုပ်တာ ရပ်မယ် (idea အသစ်တွေပဲ yield)။
+    """
     target_url = TRADINGVIEW_SYMBOL_IDEAS_BASE_URL.format(symbol=symbol.upper())
     logger.info(f"Starting Selenium scraper for symbol: {symbol.upper()} at {target_url}")
 
     driver = None
+    driver_broken = False
     try:
-        driver = setup_selenium_driver() # Driver ကို setup လုပ်
+        with METRICS.timer("scrape_stage_seconds", stage="driver_startup"):
+            driver = DRIVER_POOL.acquire() # Pool ထဲက warm driver ကို အရင်သုံး
+            if driver is None:
+                logger.info("Driver pool is empty. Launching a new Chrome driver.")
+                driver = setup_selenium_driver() # Pool ကုန်နေမှ Driver အသစ် setup လုပ်
         if driver is None:
-            return None # Driver setup မအောင်မြင်ရင် None ပြန်
+            raise DriverUnavailableError("Chrome driver setup failed.") # Driver setup မအောင်မြင်ရင် scrape မအောင်မြင်
 
         logger.info(f"Navigating to {target_url}")
-        driver.get(target_url)
+        with METRICS.timer("scrape_stage_seconds", stage="page_load"):
+            driver.get(target_url)
 
         # --- Check for symbol not found page ---
         page_source_lower = driver.page_source.lower()
         if "symbol lookup" in page_source_lower or "we looked everywhere" in page_source_lower:
             logger.warning(f"Symbol {symbol.upper()} not found on TradingView.")
-            return [] # Symbol မတွေ့ရင် list အလွတ် ပြန်
+            return # Symbol မတွေ့ရင် ဘာမှ မ yield
+
+        # --- Cookie Consent (Cookie button (သို့) idea card တစ်ခုခု ပေါ်လာတာနဲ့ ဆက်သွား) ---
+        # TradingView က banner ကို re-render လုပ်တတ်လို့ stale ဖြစ်သွားတဲ့ button ကို နောက်တစ်ခေါက် ပြန်ရှာ
+        def cookie_button_or_articles(d):
+            buttons = d.find_elements(By.CSS_SELECTOR, COOKIE_ACCEPT_SELECTOR)
+            if buttons and buttons[0].is_displayed() and buttons[0].is_enabled(): return buttons[0]
+            return "articles" if d.find_elements(By.TAG_NAME, "article") else False
 
-        # --- Cookie Consent ---
         try:
-            WebDriverWait(driver, 10).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, "button.tv-dialog__accept-button"))
-            ).click()
-            logger.info("Cookie accept button clicked.")
-            time.sleep(2)
-        except TimeoutException:
-            logger.info("Cookie pop-up not found or timed out.")
+            with METRICS.timer("scrape_stage_seconds", stage="cookie_wait"):
+                ready = WebDriverWait(driver, 10, ignored_exceptions=(StaleElementReferenceException,)).until(cookie_button_or_articles)
+                if ready != "articles":
+                    ready.click()
+                    logger.info("Cookie accept button clicked.")
+                    WebDriverWait(driver, 5).until(EC.invisibility_of_element_located((By.CSS_SELECTOR, COOKIE_ACCEPT_SELECTOR)))
+        except (TimeoutException, StaleElementReferenceException):
+            logger.info("Cookie pop-up not found, timed out or re-rendered before the click.")
 
         # --- Wait for Idea Cards ---
         logger.info("Waiting for idea cards ('article' tag) to load...")
         try:
-            WebDriverWait(driver, 45).until(
-                EC.presence_of_element_located((By.TAG_NAME, "article"))
-            )
+            with METRICS.timer("scrape_stage_seconds", stage="article_wait"):
+                WebDriverWait(driver, 45).until(
+                    EC.presence_of_element_located((By.TAG_NAME, "article"))
+                )
         except TimeoutException:
              logger.warning(f"Timeout waiting for 'article' elements for symbol {symbol.upper()}. Page might have no ideas or structure changed.")
              # Screenshot ရိုက်ကြည့်နိုင် (local မှာ run ရင်)
              # if not (os.environ.get('RENDER') == 'true'): driver.save_screenshot(f"{symbol}_timeout.png")
-             return []
+             return
 
         logger.info("Page loaded. Starting data extraction...")
+        extraction_started = time.perf_counter()
+        if CARD_EXTRACTION_MODE == 'js':
+            raw_cards = extract_raw_cards_js(driver)
+            if raw_cards is not None:
+                scraped_ideas = ideas_from_raw_cards(raw_cards, symbol, known_links)
+                METRICS.observe("scrape_stage_seconds", time.perf_counter() - extraction_started, stage="card_extraction")
+                logger.info(f"Bulk JS extraction parsed {len(scraped_ideas)} ideas within 24h for {symbol.upper()}.")
+                yield from scraped_ideas
+                return
+            logger.info("Falling back to per-element card extraction.")
+
         idea_cards = driver.find_elements(By.TAG_NAME, "article")
 
         if not idea_cards:
             logger.info(f"No 'article' elements found for symbol {symbol.upper()}.")
-            return []
+            return
 
-        scraped_ideas = []
         now_ts = time.time()
         time_limit_ts = now_ts - TIME_FILTER_SECONDS
+        known_streak = 0
+        chunk = [] # Enrich မလုပ်ရသေးတဲ့ ideas
 
-        for i, card in enumerate(idea_cards[:30]): # နည်းနည်း ပိုယူထားမယ် (Filter မလုပ်ခင်)
+        for i, card in enumerate(idea_cards[:MAX_CARDS_PER_PAGE]): # နည်းနည်း ပိုယူထားမယ် (Filter မလုပ်ခင်)
             try:
                 # --- Extract Data (Selectors from previous working version) ---
                 title_element = card.find_element(By.CSS_SELECTOR, 'a.title-tkslJwxl')
                 full_link = title_element.get_attribute('href')
+                if known_links and full_link in known_links:
+                    known_streak += 1
+                    if known_streak >= KNOWN_LINK_STOP_STREAK:
+                        logger.debug(f"Reached {known_streak} already stored ideas in a row for {symbol.upper()}. Stopping card parsing.")
+                        break # ဒီနောက်က card တွေက သိမ်းပြီးသား (အဟောင်း) တွေ
+                    continue # Pinned / promoted card ဖြစ်နိုင် - နောက်က idea အသစ်တွေ ဆက်ရှာ
+                known_streak = 0
                 title = title_element.text.strip()
                 if not title: title = title_element.get_attribute('title')
 
                 timestamp = now_ts # Default to now if time extraction fails
                 try:
                     time_element = card.find_element(By.TAG_NAME, 'time')
-                    dt_str = time_element.get_attribute('datetime')
-                    timestamp = datetime.fromisoformat(dt_str.replace('Z', '+00:00')).timestamp()
+                    timestamp = parse_card_timestamp(time_element.get_attribute('datetime'), now_ts)
                 except: pass
 
                 # --- !!! အချိန် စစ်ထုတ်ခြင်း (Scraping လုပ်ရင်း) !!! ---
@@ -212,52 +1018,654 @@ def fetch_ideas_selenium(symbol: str): # <-- Function name ပြောင်း
                 position_emoji = '⚪️'
                 try:
                     type_element = card.find_element(By.CSS_SELECTOR, 'span.idea-strategy-icon-wrap-cbI7LT3N')
-                    idea_type_str = type_element.get_attribute('title') # "Short" or "Long"
-                    if idea_type_str == 'Long':
-                         idea_type, position_emoji = 'Long', '🟢'
-                    elif idea_type_str == 'Short':
-                         idea_type, position_emoji = 'Short', '🔴'
+                    idea_type, position_emoji = strategy_to_position(type_element.get_attribute('title')) # "Short" or "Long"
                 except: pass
 
                 likes_count = 0
                 try:
                     likes_element = card.find_element(By.CSS_SELECTOR, 'button[data-qa-id="ui-lib-card-like-button"]')
-                    likes_str = likes_element.text.strip()
-                    if 'K' in likes_str: likes_count = int(float(likes_str.replace('K', '')) * 1000)
-                    elif likes_str.isdigit(): likes_count = int(likes_str)
+                    likes_count = parse_likes_text(likes_element.text)
+                except: pass
+
+                summary = ''
+                try:
+                    summary = card.find_element(By.CSS_SELECTOR, 'p.paragraph-t3qFZvNN').get_attribute('innerHTML')
                 except: pass
 
-                if image_url and image_url.startswith('/'):
-                    image_url = "https://www.tradingview.com" + image_url
-                if image_url and not image_url.startswith('http'):
-                    image_url = None # Invalid image URL
+                image_url = normalize_image_url(image_url)
 
-                scraped_ideas.append({
+                chunk.append({
                     'title': title, 'symbol': current_symbol, 'type': idea_type,
                     'position_emoji': position_emoji, # Emoji ကိုပါ ထည့်သိမ်း
                     'likes_count': likes_count, # Likes ပါ ပြန်ထည့်ထား
                     'published_time': timestamp,
-                    'image_url': image_url, 'full_link': full_link
+                    'image_url': image_url, 'full_link': full_link,
+                    'summary': summary,
                 })
+                if len(chunk) >= ELEMENT_ENRICH_CHUNK_SIZE:
+                    yield from enrich_ideas(chunk)
+                    chunk = []
 
             except NoSuchElementException as e:
                 # logger.warning(f"Could not scrape some element in card #{i+1} for {symbol.upper()}: {e.msg}")
-                pass
+                METRICS.inc("cards_skipped_total", reason="no_such_element", engine="selenium")
 
-        # Sort by published time, most recent first (24h filter လုပ်ပြီးသား)
-        scraped_ideas.sort(key=lambda x: x['published_time'], reverse=True)
-        logger.info(f"Successfully scraped {len(scraped_ideas)} ideas within 24h for {symbol.upper()}.")
-        return scraped_ideas
+        yield from enrich_ideas(chunk) # ကျန်တဲ့ ideas (break နဲ့ ရပ်ခဲ့ရင်လည်း)
+        METRICS.observe("scrape_stage_seconds", time.perf_counter() - extraction_started, stage="card_extraction")
 
-    except Exception as e:
-        logger.error(f"Error during Selenium scraping for {symbol.upper()}: {e}", exc_info=True)
+    except Exception:
+        driver_broken = True # Error တက်ခဲ့တဲ့ driver ကို pool ထဲ ပြန်မထည့်
         # Screenshot ရိုက်ကြည့်နိုင် (local မှာ run ရင်)
         # if driver and not (os.environ.get('RENDER') == 'true'): driver.save_screenshot(f"{symbol}_error.png")
-        return None # Error ဖြစ်ရင် None ပြန်
+        raise
     finally:
         if driver:
-            driver.quit()
-            logger.info(f"Chrome driver quit for {symbol.upper()}.")
+            DRIVER_POOL.release(driver, discard=driver_broken)
+            logger.info(f"Chrome driver returned for {symbol.upper()}.")
+
+
+def fetch_ideas_selenium(symbol: str, known_links=None, on_idea=None): # <-- Function name ပြောင်းထား
+    """Specific symbol အတွက် TradingView Ideas page ကို Selenium ဖြင့် Scrape လုပ်ပြီး list (နောက်ဆုံး အရင်) ပြန် (Error ဆို None)
+
+    on_idea ပေးထားရင် idea တစ်ခု parse ပြီးတာနဲ့ (scraper thread ထဲကနေ) ချက်ချင်း ခေါ်မယ် (streaming)။
+    """
+    scraped_ideas = []
+    try:
+        for idea in iter_ideas_selenium(symbol, known_links):
+            scraped_ideas.append(idea)
+            if on_idea: on_idea(idea)
+    except Exception as e:
+        # Driver setup error ကို setup_selenium_driver က log လုပ်ပြီးသား
+        logger.error(f"Error during Selenium scraping for {symbol.upper()}: {e}", exc_info=not isinstance(e, DriverUnavailableError))
+        return None # Error ဖြစ်ရင် None ပြန်
+
+    # Sort by published time, most recent first (24h filter လုပ်ပြီးသား)
+    scraped_ideas.sort(key=lambda x: x['published_time'], reverse=True)
+    logger.info(f"Successfully scraped {len(scraped_ideas)} ideas within 24h for {symbol.upper()}.")
+    return scraped_ideas
+
+# -----------------------------------------------------------------
+# --- Out-of-process Scraper Workers (SCRAPER_MODE=process) ---
+# -----------------------------------------------------------------
+def scraper_process_main(conn, max_rss_mb=DRIVER_MAX_RSS_MB):
+    """Worker process entry point - Pipe ကနေ ('scrape', symbol, known_links) job တွေ လက်ခံပြီး driver တစ်ခုတည်းနဲ့ scrape
+
+    Parse ပြီးတဲ့ idea တစ်ခုချင်းကို ('idea', idea)၊ ပြီးရင် ('result', ideas_or_None, metrics_snapshot) ပြန်ပို့မယ်။
+    metrics_snapshot က ဒီ process ထဲမှာ မှတ်ထားတဲ့ scrape_stage_seconds / cards_skipped_total စတာတွေ (parent က METRICS ထဲ ပေါင်း)။
+    """
+    global DRIVER_POOL
+    if hasattr(os, 'setsid'):
+        os.setsid() # Process group သီးသန့် - parent က Chrome/chromedriver တွေပါ တစ်ခါတည်း kill နိုင်အောင်
+    DRIVER_POOL = DriverPool(size=1, max_page_loads=SCRAPER_PROCESS_MAX_JOBS + 1, max_rss_mb=max_rss_mb)
+    DRIVER_POOL.warm_up()
+    try:
+        while True:
+            try:
+                message = conn.recv()
+            except EOFError: # Parent ပိတ်သွားရင်
+                break
+            if message[0] == 'stop': break
+            _, symbol, known_links = message
+            ideas = fetch_ideas_selenium(symbol, known_links, on_idea=lambda idea: conn.send(('idea', idea)))
+            conn.send(('result', ideas, METRICS.drain()))
+    finally:
+        DRIVER_POOL.shutdown()
+
+
+class ScraperProcess:
+    """Worker process တစ်ခုနဲ့ သူ့ဆီ job ပို့မယ့် Pipe"""
+
+    def __init__(self, context, number):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=scraper_process_main, args=(child_conn,), name=f"scraper-{number}", daemon=True)
+        self.process.start()
+        child_conn.close() # Worker သေရင် parent ဘက်မှာ EOFError ရအောင်
+        self.jobs = 0
+
+    def stop(self, timeout=30):
+        """Job မရှိတော့တဲ့ worker ကို driver ပိတ်ပြီး ထွက်ခိုင်း၊ မထွက်ရင် kill"""
+        try:
+            self.conn.send(('stop',))
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout)
+        if self.process.is_alive(): self.kill()
+        self.conn.close()
+
+    def kill(self):
+        """Worker process နဲ့ သူဖွင့်ထားတဲ့ Chrome process အားလုံးကို ချက်ချင်း သတ်"""
+        try:
+            os.killpg(self.process.pid, signal.SIGKILL)
+        except (AttributeError, OSError):
+            self.process.kill()
+        self.process.join(5)
+        self.conn.close()
+
+
+class ScraperProcessPool:
+    """Chrome scrape တွေကို bot process အပြင်က worker process တွေဆီ လွှဲမယ့် pool
+
+    - Worker process တစ်ခုစီမှာ ကိုယ်ပိုင် driver ရှိပြီး GIL / memory ကို bot နဲ့ မမျှ
+    - Job SCRAPER_PROCESS_MAX_JOBS ခု ပြီးရင် (သို့) crash / hang ဖြစ်ရင် worker ကို process အသစ်နဲ့ လဲ
+    - scrape() က blocking (asyncio.to_thread နဲ့ ခေါ်)၊ fetch_ideas_selenium နဲ့ contract တူ
+    """
+
+    def __init__(self, size=SCRAPER_PROCESSES, max_jobs=SCRAPER_PROCESS_MAX_JOBS, job_timeout=SCRAPER_PROCESS_JOB_TIMEOUT_SECONDS):
+        self.size = max(1, size)
+        self.max_jobs = max(1, max_jobs)
+        self.job_timeout = job_timeout
+        self._context = multiprocessing.get_context('spawn') # Fork က bot ရဲ့ event loop / thread တွေကို ကူးယူမှာမို့ spawn
+        self._idle = []
+        self._slots = threading.Semaphore(self.size)
+        self._lock = threading.Lock()
+        self._spawned = 0
+        self._closed = False
+        self.alive = 0
+
+    def warm_up(self):
+        """Pool size ပြည့်အောင် worker process တွေ ကြိုဖွင့်ထား (Blocking - thread ထဲကနေ ခေါ်ပါ)"""
+        while True:
+            with self._lock:
+                if self._closed or self.alive >= self.size: break
+            worker = self._spawn()
+            with self._lock:
+                if not self._closed:
+                    self._idle.append(worker)
+                    continue
+            self._retire(worker)
+        logger.info(f"Scraper process pool ready: {self.alive} worker processes.")
+
+    def scrape(self, symbol, known_links=None, on_idea=None):
+        """Idle worker process တစ်ခုကို job ပို့ပြီး result (list / [] / None) ကို စောင့်"""
+        with self._slots:
+            with self._lock:
+                if self._closed: return None
+                worker = self._idle.pop() if self._idle else None
+            if worker is None: worker = self._spawn()
+            try:
+                worker.conn.send(('scrape', symbol, known_links))
+                deadline = time.monotonic() + self.job_timeout # Message တစ်ခုချင်း မဟုတ်ဘဲ job တစ်ခုလုံးအတွက်
+                while True:
+                    # Chrome hang ဖြစ်ရင် thread mode လို နောက်ကွယ်မှာ မကျန်ခဲ့အောင် process ကိုပါ သတ်
+                    if not worker.conn.poll(max(0, deadline - time.monotonic())):
+                        raise TimeoutError(f"job not finished within {self.job_timeout:.0f}s")
+                    message = worker.conn.recv()
+                    if message[0] == 'idea':
+                        if on_idea: on_idea(message[1])
+                        continue
+                    _, payload, worker_metrics = message
+                    METRICS.merge(worker_metrics)
+                    break
+            except (EOFError, OSError) as e: # TimeoutError က OSError ထဲ ပါ
+                logger.error(f"Scraper process {worker.process.name} failed on {symbol.upper()} ({e or 'exited'}). Replacing it.")
+                METRICS.inc("scraper_process_restarts_total", reason="timeout" if isinstance(e, TimeoutError) else "crash")
+                self._retire(worker, kill=True)
+                return None
+
+            worker.jobs += 1
+            if worker.jobs >= self.max_jobs:
+                logger.info(f"Recycling scraper process {worker.process.name} after {worker.jobs} jobs.")
+                METRICS.inc("scraper_process_restarts_total", reason="max_jobs")
+                self._retire(worker)
+            else:
+                with self._lock:
+                    if not self._closed and len(self._idle) < self.size:
+                        self._idle.append(worker)
+                        worker = None
+                if worker is not None: self._retire(worker) # Pool ပြည့်နေရင် (warm-up မပြီးခင် ဖွင့်ခဲ့တဲ့ worker) ပိတ်
+            return payload
+
+    def shutdown(self):
+        """Worker process အားလုံးကို ရပ်"""
+        with self._lock:
+            self._closed = True
+            workers = list(self._idle)
+            self._idle.clear()
+        for worker in workers:
+            self._retire(worker)
+        logger.info(f"Scraper process pool shut down ({len(workers)} workers stopped).")
+
+    def _spawn(self):
+        with self._lock:
+            self._spawned += 1
+            self.alive += 1
+            number = self._spawned
+        return ScraperProcess(self._context, number)
+
+    def _retire(self, worker, kill=False):
+        """Worker ကို ပိတ်ပြီး pool မပိတ်ရသေးရင် နောက်ကွယ်မှာ အစားထိုး worker ဖွင့်"""
+        if kill: worker.kill()
+        else: worker.stop()
+        with self._lock:
+            self.alive -= 1
+            if self._closed: return
+        threading.Thread(target=self.warm_up, name="scraper-respawn", daemon=True).start()
+
+
+SCRAPER_PROCESS_POOL = ScraperProcessPool()
+METRICS.gauge("scraper_processes_alive", lambda: SCRAPER_PROCESS_POOL.alive)
+
+# -----------------------------------------------------------------
+# --- HTTP Fast Path (Chrome မဖွင့်ဘဲ Server-rendered HTML ကို parse) ---
+# -----------------------------------------------------------------
+HTTP_CLIENT = None # Connection pool ကို request တိုင်း ပြန်သုံးဖို့ shared client
+
+def get_http_client():
+    global HTTP_CLIENT
+    if HTTP_CLIENT is None or HTTP_CLIENT.is_closed:
+        HTTP_CLIENT = httpx.AsyncClient(
+            headers={'User-Agent': HTTP_USER_AGENT, 'Accept-Language': 'en-US,en;q=0.9'},
+            timeout=HTTP_TIMEOUT_SECONDS,
+            limits=httpx.Limits(max_connections=HTTP_MAX_CONNECTIONS, max_keepalive_connections=HTTP_MAX_CONNECTIONS),
+            follow_redirects=True,
+        )
+    return HTTP_CLIENT
+
+async def close_http_client():
+    global HTTP_CLIENT
+    if HTTP_CLIENT is not None:
+        await HTTP_CLIENT.aclose()
+        HTTP_CLIENT = None
+
+def raw_cards_from_html(html):
+    """Server-rendered page ထဲက <article> card တွေကို raw card dict list ပြောင်း (Selenium နဲ့ selector တူ)"""
+    soup = BeautifulSoup(html, "html.parser")
+    raw_cards = []
+    for card in soup.find_all('article', limit=MAX_CARDS_PER_PAGE):
+        title_element = card.select_one('a.title-tkslJwxl')
+        image_element = card.select_one('img.image-gDIex6UB')
+        if title_element is None or image_element is None: # Selenium မှာ NoSuchElementException နဲ့ ကျော်တာနဲ့ တူ
+            METRICS.inc("cards_skipped_total", reason="missing_element", engine="http")
+            continue
+        time_element = card.find('time')
+        type_element = card.select_one('span.idea-strategy-icon-wrap-cbI7LT3N')
+        likes_element = card.select_one('button[data-qa-id="ui-lib-card-like-button"]')
+        summary_element = card.select_one('p.paragraph-t3qFZvNN')
+        href = title_element.get('href') or ''
+        raw_cards.append({
+            'title': title_element.get_text(strip=True) or title_element.get('title'),
+            'link': "https://www.tradingview.com" + href if href.startswith('/') else href,
+            'datetime': time_element.get('datetime') if time_element else None,
+            'image_src': image_element.get('src') or image_element.get('data-src'),
+            'strategy': type_element.get('title') if type_element else None,
+            'likes_text': likes_element.get_text(strip=True) if likes_element else '',
+            'summary': summary_element.decode_contents() if summary_element else '',
+        })
+    return raw_cards
+
+def raw_cards_from_embedded_json(html):
+    """<script type="application/...json"> ထဲက idea object တွေကို ရှာ (HTML card မပါတဲ့ page အတွက် best-effort)"""
+    soup = BeautifulSoup(html, "html.parser")
+    raw_cards = []
+
+    def walk(node):
+        if isinstance(node, dict):
+            link = node.get('chart_url') or node.get('published_url') or node.get('url')
+            title = node.get('name') or node.get('title')
+            if isinstance(link, str) and '/chart/' in link and isinstance(title, str):
+                created = node.get('created_at') or node.get('date_published') or node.get('published_at')
+                if isinstance(created, (int, float)):
+                    created = datetime.fromtimestamp(created, tz=timezone.utc).isoformat()
+                image = node.get('image_url') or node.get('image')
+                if isinstance(image, dict): image = image.get('big') or image.get('middle') or image.get('url')
+                strategy = node.get('strategy') or node.get('direction')
+                raw_cards.append({
+                    'title': title,
+                    'link': "https://www.tradingview.com" + link if link.startswith('/') else link,
+                    'datetime': created,
+                    'image_src': image if isinstance(image, str) else None,
+                    'strategy': strategy.capitalize() if isinstance(strategy, str) else None,
+                    'likes_text': str(node.get('likes_count') or node.get('likes') or ''),
+                    'summary': node.get('description') if isinstance(node.get('description'), str) else '',
+                })
+                return
+            for value in node.values(): walk(value)
+        elif isinstance(node, list):
+            for value in node: walk(value)
+
+    for script in soup.find_all('script', type=re.compile(r'json')):
+        try:
+            walk(json.loads(script.string or ''))
+        except ValueError:
+            continue
+        if len(raw_cards) >= MAX_CARDS_PER_PAGE: break
+    return raw_cards
+
+async def fetch_ideas_http(symbol: str, known_links=None):
+    """Ideas page ကို httpx နဲ့ GET ပြီး parse (list ပြန်)။ Parse မရ/JS လိုရင် None ပြန် (Selenium fallback အတွက်)"""
+    target_url = TRADINGVIEW_SYMBOL_IDEAS_BASE_URL.format(symbol=symbol.upper())
+    try:
+        with METRICS.timer("scrape_stage_seconds", stage="http_fetch"):
+            response = await get_http_client().get(target_url)
+    except httpx.HTTPError as e:
+        logger.warning(f"HTTP fetch failed for {symbol.upper()}: {e}")
+        return None
+    if response.status_code == 404:
+        logger.warning(f"Symbol {symbol.upper()} not found on TradingView (HTTP 404).")
+        return []
+    if response.status_code != 200:
+        logger.warning(f"HTTP fetch for {symbol.upper()} returned status {response.status_code}.")
+        return None
+
+    html = response.text
+    page_lower = html.lower()
+    if "symbol lookup" in page_lower or "we looked everywhere" in page_lower:
+        logger.warning(f"Symbol {symbol.upper()} not found on TradingView.")
+        return []
+
+    # BeautifulSoup parse က CPU-bound ဖြစ်လို့ event loop ကို မပိတ်အောင် thread ထဲမှာ လုပ်
+    raw_cards = await asyncio.to_thread(raw_cards_from_html, html)
+    if not raw_cards:
+        raw_cards = await asyncio.to_thread(raw_cards_from_embedded_json, html)
+    if not raw_cards:
+        logger.info(f"No idea cards in server-rendered HTML for {symbol.upper()}. Page probably needs JS.")
+        return None
+
+    scraped_ideas = ideas_from_raw_cards(raw_cards, symbol, known_links, engine="http")
+    logger.info(f"HTTP fast path scraped {len(scraped_ideas)} ideas within 24h for {symbol.upper()}.")
+    return scraped_ideas
+
+async def fetch_ideas(symbol: str, on_idea=None):
+    """SCRAPE_ENGINE အလိုက် HTTP fast path (သို့) Selenium နဲ့ ideas အသစ်တွေ scrape ပြီး IDEA_STORE ထဲ သိမ်း
+
+    Store ထဲက နောက်ဆုံး ၂၄ နာရီ ideas အားလုံး (list / []) ကို ပြန်ပေးမယ်၊ scrape မအောင်မြင်ရင် None။
+    on_idea ပေးထားရင် idea အသစ် တစ်ခုရတိုင်း page အစဉ်အတိုင်း ခေါ်မယ် (Selenium ဆို scraper thread ထဲကနေ ခေါ်)။
+    """
+    time_limit_ts = time.time() - TIME_FILTER_SECONDS
+    known_links = await asyncio.to_thread(IDEA_STORE.known_links, symbol, time_limit_ts)
+
+    new_ideas = None
+    if SCRAPE_ENGINE in ('auto', 'http'):
+        new_ideas = await fetch_ideas_http(symbol, known_links)
+        if new_ideas is None and SCRAPE_ENGINE == 'auto':
+            logger.info(f"Falling back to Selenium for {symbol.upper()}.")
+        elif new_ideas and on_idea:
+            for idea in new_ideas: on_idea(idea)
+    if new_ideas is None and SCRAPE_ENGINE in ('auto', 'selenium'):
+        scrape_selenium = SCRAPER_PROCESS_POOL.scrape if SCRAPER_MODE == 'process' else fetch_ideas_selenium
+        new_ideas = await asyncio.to_thread(scrape_selenium, symbol, known_links, on_idea)
+    if new_ideas is None:
+        METRICS.inc("scrape_failures_total", reason="error")
+        return None
+    if not new_ideas and not known_links:
+        METRICS.inc("scrape_empty_total")
+
+    logger.info(f"{len(new_ideas)} new ideas for {symbol.upper()} ({len(known_links)} already stored).")
+    await asyncio.to_thread(IDEA_STORE.save_ideas, new_ideas)
+    return await asyncio.to_thread(IDEA_STORE.recent_ideas, [symbol], time_limit_ts)
+
+# -----------------------------------------------------------------
+# --- Idea Result Cache (TTL + LRU + Stale-While-Revalidate) ---
+# -----------------------------------------------------------------
+class IdeaCache:
+    """Symbol -> scrape လုပ်ထားတဲ့ idea list ကို သိမ်းထားမယ့် in-process cache"""
+
+    def __init__(self, ttl=IDEA_CACHE_TTL_SECONDS, stale_ttl=IDEA_CACHE_STALE_SECONDS, max_entries=IDEA_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.stale_ttl = max(ttl, stale_ttl)
+        self.max_entries = max_entries
+        self._entries = OrderedDict() # symbol -> (stored_at, ideas)
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def get(self, symbol, in_flight=False):
+        """(ideas, is_stale) ပြန်။ Cache မှာ မရှိရင် (သို့) stale_ttl ကျော်သွားရင် (None, False)
+
+        in_flight: Symbol ကို scrape နေဆဲ (scheduler job ရှိပြီးသား) ဆို miss မဟုတ်ဘဲ coalesced အဖြစ် ရေတွက်
+        """
+        entry = self._entries.get(symbol)
+        if entry is not None and time.time() - entry[0] > self.stale_ttl:
+            del self._entries[symbol]
+            entry = None
+        if entry is None:
+            if in_flight:
+                self.coalesced += 1
+                METRICS.inc("idea_cache_coalesced_total")
+            else:
+                self.misses += 1
+                METRICS.inc("idea_cache_misses_total")
+            return None, False
+        stored_at, ideas = entry
+        self._entries.move_to_end(symbol)
+        is_stale = time.time() - stored_at > self.ttl
+        if is_stale:
+            self.stale_hits += 1
+            METRICS.inc("idea_cache_stale_hits_total")
+        else:
+            self.hits += 1
+            METRICS.inc("idea_cache_hits_total")
+        # Cache ထဲမှာ ရှိနေစဉ် ၂၄ နာရီ ကျော်သွားတဲ့ idea တွေကို ဖယ်
+        time_limit_ts = time.time() - TIME_FILTER_SECONDS
+        return [idea for idea in ideas if idea['published_time'] >= time_limit_ts], is_stale
+
+    def put(self, symbol, ideas):
+        self._entries[symbol] = (time.time(), list(ideas))
+        self._entries.move_to_end(symbol)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+            METRICS.inc("idea_cache_evictions_total")
+
+    def stats(self):
+        lookups = self.hits + self.stale_hits + self.misses + self.coalesced
+        hit_rate = (self.hits + self.stale_hits) / lookups if lookups else 0.0
+        return {'entries': len(self._entries), 'hits': self.hits, 'stale_hits': self.stale_hits,
+                'misses': self.misses, 'coalesced': self.coalesced, 'evictions': self.evictions, 'hit_rate': round(hit_rate, 3)}
+
+
+IDEA_CACHE = IdeaCache()
+
+# -----------------------------------------------------------------
+# --- Scrape Scheduler (Job Queue + Single-flight + Per-user Fairness) ---
+# -----------------------------------------------------------------
+class QueueFullError(Exception):
+    """Scrape queue ပြည့်နေလို့ job အသစ် လက်မခံနိုင်"""
+
+
+class ScrapeScheduler:
+    """Symbol scrape job တွေကို တန်းစီပြီး worker တွေနဲ့ ခွဲလုပ်မယ့် scheduler
+
+    - Symbol တူတဲ့ request တွေက in-flight job (future) တစ်ခုတည်းကို မျှသုံး (single-flight)
+    - User တစ်ယောက်ချင်းစီ queue သီးသန့်ရှိပြီး round-robin နဲ့ ထုတ်လို့ symbol များတဲ့ user က ကျန်သူတွေကို မပိတ်ဆို့
+    - IdeaCache ထဲမှာ ရှိရင် scrape မလုပ်ဘဲ ချက်ချင်း ပြန်ပေး (stale ဆိုရင် နောက်ကွယ်မှာ refresh)
+    - Listener queue ပေးထားရင် job မပြီးခင် parse ပြီးသလောက် ideas တွေကို ('idea', symbol, idea) အဖြစ် ထည့်ပေး (streaming)
+    """
+
+    REFRESH_USER_ID = "cache-refresh" # Background refresh job တွေအတွက် queue
+
+    def __init__(self, workers=SCRAPE_CONCURRENCY, max_queue_size=SCRAPE_QUEUE_MAX_SIZE, timeout=SCRAPE_TIMEOUT_SECONDS):
+        self.workers = max(1, workers)
+        self.max_queue_size = max_queue_size
+        self.timeout = timeout
+        self._user_queues = OrderedDict() # user_id -> deque([symbol, ...])
+        self._jobs = {} # symbol -> asyncio.Future (queued or in-flight)
+        self._partials = {} # symbol -> [idea, ...] (in-flight job က ရပြီးသား ideas - နောက်မှ ဝင်လာတဲ့ listener အတွက်)
+        self._listeners = {} # symbol -> [asyncio.Queue, ...]
+        self._queued_count = 0
+        self._busy_workers = 0
+        self._wakeup = None # Event loop ထဲမှာမှ ဆောက် (Python 3.9 မှာ import ချိန် loop နဲ့ ချိတ်မိမှာစိုးလို့)
+        self._worker_tasks = []
+
+    @property
+    def queue_depth(self):
+        return self._queued_count
+
+    @property
+    def _condition(self):
+        if self._wakeup is None: self._wakeup = asyncio.Condition()
+        return self._wakeup
+
+    async def start(self):
+        """Worker task တွေကို bot ရဲ့ event loop ထဲမှာ စတင်"""
+        if self._worker_tasks: return
+        self._worker_tasks = [asyncio.create_task(self._worker(n)) for n in range(self.workers)]
+        logger.info(f"Scrape scheduler started with {self.workers} workers (queue limit {self.max_queue_size}).")
+
+    async def stop(self):
+        """Worker တွေကို ရပ်ပြီး မပြီးသေးတဲ့ job တွေကို cancel လုပ်"""
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+        for future in self._jobs.values():
+            if not future.done(): future.cancel()
+        self._jobs.clear()
+        self._partials.clear()
+        self._listeners.clear()
+        self._user_queues.clear()
+        self._queued_count = 0
+        self._wakeup = None # နောက် start() က loop အသစ်နဲ့ ပြန်ဆောက်
+
+    async def submit(self, symbols, user_id, listener=None, bypass_cache=False):
+        """Symbol တွေကို queue ထဲ ထည့်ပြီး ({symbol: future}, queue_position) ပြန်
+
+        queue_position က ဒီ request ရဲ့ တန်းစီ နံပါတ် (0 ဆို ချက်ချင်း စမယ်)။
+        listener (asyncio.Queue) ပေးထားရင် scrape လုပ်ရမယ့် symbol တွေရဲ့ ideas ကို ရလာသလို ထည့်ပေးမယ်။
+        bypass_cache: IdeaCache ကို မကြည့်ဘဲ အမြဲ scrape (in-flight job ရှိရင်တော့ မျှသုံး) - Subscription poller အတွက်
+        """
+        loop = asyncio.get_running_loop()
+        futures = {}
+        stale_symbols = []
+        async with self._condition:
+            for symbol in () if bypass_cache else dict.fromkeys(symbols):
+                cached_ideas, is_stale = IDEA_CACHE.get(symbol, in_flight=symbol in self._jobs)
+                if cached_ideas is None: continue
+                futures[symbol] = loop.create_future()
+                futures[symbol].set_result(cached_ideas)
+                if is_stale: stale_symbols.append(symbol)
+
+            wanted = [symbol for symbol in dict.fromkeys(symbols) if symbol not in futures]
+            new_symbols = [symbol for symbol in wanted if symbol not in self._jobs]
+            if self._queued_count + len(new_symbols) > self.max_queue_size:
+                raise QueueFullError(f"Scrape queue is full ({self._queued_count}/{self.max_queue_size}).")
+
+            # Worker အားမရှိရင် တန်းစီ နံပါတ် (1 ကစ)၊ ချက်ချင်း စနိုင်ရင် 0
+            waiting = self._queued_count
+            queue_position = waiting + 1 if new_symbols and self._busy_workers + waiting >= self.workers else 0
+            for symbol in new_symbols:
+                self._enqueue(symbol, user_id, loop)
+
+            # Stale result ကို ပြန်ပေးပြီးပြီ၊ queue နေရာ ရှိမှ နောက်ကွယ်မှာ refresh
+            for symbol in stale_symbols:
+                if symbol not in self._jobs and self._queued_count < self.max_queue_size:
+                    self._enqueue(symbol, self.REFRESH_USER_ID, loop)
+
+            for symbol in wanted:
+                futures[symbol] = self._jobs[symbol]
+                if listener is None: continue
+                self._listeners.setdefault(symbol, []).append(listener)
+                for idea in self._partials.get(symbol, ()): # In-flight job က ရပြီးသား ideas ကို ပြန်ပေး
+                    listener.put_nowait(('idea', symbol, idea))
+            if len(wanted) > len(new_symbols):
+                logger.info(f"Coalesced {len(wanted) - len(new_symbols)} symbol(s) for user {user_id} onto in-flight scrapes.")
+            return {symbol: futures[symbol] for symbol in symbols}, queue_position
+
+    def _enqueue(self, symbol, user_id, loop):
+        self._jobs[symbol] = loop.create_future()
+        self._partials[symbol] = []
+        self._user_queues.setdefault(user_id, deque()).append(symbol)
+        self._queued_count += 1
+        self._condition.notify(1)
+
+    async def _next_symbol(self):
+        """User queue တွေထဲက round-robin နဲ့ နောက် symbol တစ်ခု ထုတ်"""
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._queued_count > 0)
+            user_id, user_queue = next(iter(self._user_queues.items()))
+            symbol = user_queue.popleft()
+            if user_queue:
+                self._user_queues.move_to_end(user_id) # နောက် user ကို အလှည့်ပေး
+            else:
+                del self._user_queues[user_id]
+            self._queued_count -= 1
+            return symbol
+
+    def _publish(self, future, symbol, idea):
+        """Job တစ်ခုက parse ပြီးတဲ့ idea ကို listener တွေဆီ ပို့ (event loop ထဲမှာပဲ ခေါ်)"""
+        if self._jobs.get(symbol) is not future: return # Timeout ဖြစ်ပြီးမှ ရောက်လာတဲ့ idea
+        self._partials[symbol].append(idea)
+        for listener in self._listeners.get(symbol, ()):
+            listener.put_nowait(('idea', symbol, idea))
+
+    async def _worker(self, worker_id):
+        loop = asyncio.get_running_loop()
+        while True:
+            symbol = await self._next_symbol()
+            future = self._jobs[symbol]
+            self._busy_workers += 1
+            # Scraper thread ထဲကနေ ခေါ်မှာမို့ event loop ဆီ call_soon_threadsafe နဲ့ လွှဲ
+            on_idea = lambda idea, future=future, symbol=symbol: loop.call_soon_threadsafe(self._publish, future, symbol, idea)
+            try:
+                logger.info(f"Worker {worker_id}: fetching ideas for {symbol} ({SCRAPE_ENGINE} engine)...")
+                # Selenium thread က timeout ဖြစ်ရင် နောက်ကွယ်မှာ ဆက် run ပြီး driver ကို pool ထဲ သူ့ဘာသာ ပြန်ထည့်မယ်
+                ideas_list = await asyncio.wait_for(fetch_ideas(symbol, on_idea), self.timeout)
+                logger.info(f"Worker {worker_id}: scraper for {symbol} finished.")
+                if ideas_list is not None: IDEA_CACHE.put(symbol, ideas_list)
+                if not future.done(): future.set_result(ideas_list)
+            except asyncio.CancelledError:
+                if not future.done(): future.cancel()
+                raise
+            except Exception as e:
+                METRICS.inc("scrape_failures_total", reason="timeout" if isinstance(e, asyncio.TimeoutError) else "exception")
+                if isinstance(e, asyncio.TimeoutError):
+                    logger.error(f"Scraper timed out after {self.timeout}s for symbol {symbol}.")
+                else:
+                    logger.error(f"Scraper raised for symbol {symbol}: {e}", exc_info=True)
+                if not future.done(): future.set_exception(e)
+            finally:
+                self._busy_workers -= 1
+                self._jobs.pop(symbol, None)
+                self._partials.pop(symbol, None)
+                self._listeners.pop(symbol, None)
+
+
+SCRAPE_SCHEDULER = ScrapeScheduler()
+METRICS.gauge("scrape_queue_depth", lambda: SCRAPE_SCHEDULER.queue_depth)
+METRICS.gauge("idea_cache_entries", lambda: IDEA_CACHE.stats()['entries'])
+
+
+def fetch_outcome(future):
+    """ပြီးသွားတဲ့ scheduler future ကို (ideas_list, error) ပြောင်း - error က None / "error" / "timeout" ဖြစ်"""
+    if future.cancelled(): return None, "error"
+    if isinstance(future.exception(), asyncio.TimeoutError): return None, "timeout"
+    if future.exception() is not None: return None, "error"
+    ideas_list = future.result()
+    return ideas_list, "error" if ideas_list is None else None
+
+
+async def collect_fetch_results(futures):
+    """Scheduler future တွေ ပြီးအောင် စောင့်ပြီး {symbol: (ideas_list, error)} ပြန်
+
+    ideas_list က fetch_ideas_selenium ရဲ့ result (list or None)၊ error က None / "error" / "timeout"။
+    """
+    async def wait_one(symbol, future):
+        try:
+            # shield: ဒီ handler cancel ဖြစ်ရင်တောင် တခြား user တွေ မျှသုံးနေတဲ့ job ကို မထိခိုက်စေ
+            await asyncio.shield(future)
+        except Exception:
+            pass
+        return symbol, fetch_outcome(future)
+
+    results = await asyncio.gather(*(wait_one(symbol, future) for symbol, future in futures.items()))
+    return dict(results)
+
+
+async def stream_fetch_results(futures, listener):
+    """Scheduler ဆီက event တွေကို ရလာသလို yield - symbol အားလုံး 'done' ဖြစ်ရင် ရပ်
+
+    ('idea', symbol, idea): scrape လုပ်ရင်း parse ပြီးတဲ့ idea အသစ် (symbol တစ်ခုချင်းအတွက် page အစဉ်အတိုင်း)
+    ('done', symbol, (ideas_list, error)): collect_fetch_results နဲ့ တူတဲ့ နောက်ဆုံး result
+    """
+    for symbol, future in futures.items():
+        future.add_done_callback(lambda f, symbol=symbol: listener.put_nowait(('done', symbol, fetch_outcome(f))))
+    pending = set(futures)
+    while pending:
+        event = await listener.get()
+        if event[0] == 'done': pending.discard(event[1])
+        yield event
 
 # --- (format_message_caption function - Likes ပါ ပြန်ထည့်) ---
 def format_message_caption(idea):
@@ -274,8 +1682,407 @@ def format_message_caption(idea):
     caption += f"<b>Position:</b> {idea_type} {position_emoji}\n"
     caption += f"<b>Likes:</b> {likes} 🚀\n" # Likes ပါ ပြန်ထည့်ထား
     caption += f"<b>Date:</b> {date_str} 🗓️"
+    summary = idea.get('summary')
+    if summary: # Photo caption limit (1024) မကျော်အောင် တိုတိုပဲ
+        if len(summary) > CAPTION_SUMMARY_MAX_CHARS: summary = summary[:CAPTION_SUMMARY_MAX_CHARS].rsplit(' ', 1)[0] + "…"
+        caption += f"\n\n{html.escape(summary)}"
     return caption
 
+# -----------------------------------------------------------------
+# --- Telegram Delivery (Token-bucket Rate Limit + Media Group Batches) ---
+# -----------------------------------------------------------------
+class TokenBucket:
+    """rate tokens/second နဲ့ ပြန်ဖြည့်ပြီး capacity အထိ burst ခွင့်ပြုတဲ့ async token bucket"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = None # စောင့်နေသူတွေကို အစဉ်လိုက် ထွက်ခွင့်ပေး (Python 3.9 မှာ import ချိန် loop နဲ့ မချိတ်အောင် acquire ထဲမှ ဆောက်)
+
+    async def acquire(self, tokens=1):
+        """capacity ထက် များတဲ့ request (ဥပမာ ပုံ ၁၀ ပုံ album) ဆို bucket ပြည့်မှ ထွက်ပြီး ကျန်တာကို အကြွေးအဖြစ် နုတ်"""
+        needed = min(tokens, self.capacity)
+        if self._lock is None: self._lock = asyncio.Lock()
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= needed:
+                    self._tokens -= tokens # အကြွေး (အနုတ်) ဆိုရင် နောက် call တွေက ပြန်ပြည့်အောင် စောင့်ရ
+                    return
+                await asyncio.sleep((needed - self._tokens) / self.rate)
+
+
+class TelegramRateLimiter:
+    """Bot တစ်ခုလုံးအတွက် global bucket နဲ့ chat တစ်ခုချင်း bucket ကို မျှသုံးမယ့် limiter"""
+
+    MAX_TRACKED_CHATS = 1000
+
+    def __init__(self, global_rate=TELEGRAM_GLOBAL_RATE, per_chat_rate=TELEGRAM_PER_CHAT_RATE, per_chat_burst=TELEGRAM_PER_CHAT_BURST):
+        self.per_chat_rate = per_chat_rate
+        self.per_chat_burst = per_chat_burst
+        self._global = TokenBucket(global_rate, max(1, int(global_rate)))
+        self._chats = OrderedDict() # chat_id -> TokenBucket
+
+    async def acquire(self, chat_id, messages=1):
+        """API call တစ်ခု (messages = ပါဝင်တဲ့ message အရေအတွက်) ပို့ခွင့်ရအောင် စောင့်"""
+        bucket = self._chats.get(chat_id)
+        if bucket is None:
+            bucket = self._chats[chat_id] = TokenBucket(self.per_chat_rate, self.per_chat_burst)
+            if len(self._chats) > self.MAX_TRACKED_CHATS: self._chats.popitem(last=False)
+        self._chats.move_to_end(chat_id)
+        await bucket.acquire(messages) # Album ဆို Telegram က ပုံတစ်ပုံကို message တစ်ခုစီ ရေတွက်
+        await self._global.acquire(messages)
+
+
+TELEGRAM_RATE_LIMITER = TelegramRateLimiter()
+
+
+class PhotoFileIdCache:
+    """image_url -> Telegram photo file_id ကို LRU နဲ့ ကန့်သတ်ပြီး JSON file ထဲ သိမ်းထားမယ့် cache"""
+
+    SAVE_EVERY = 25 # အပြောင်းအလဲ ဒီလောက်ရှိရင် file ထဲ သိမ်း
+
+    def __init__(self, path=PHOTO_FILE_ID_CACHE_PATH, max_entries=PHOTO_FILE_ID_CACHE_MAX_ENTRIES):
+        self.path = path
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._unsaved_changes = 0
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self._entries = OrderedDict(json.load(f))
+            logger.info(f"Loaded {len(self._entries)} cached photo file_ids from {self.path}.")
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not load photo file_id cache from {self.path}: {e}")
+
+    def save(self):
+        if not self._unsaved_changes: return
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(list(self._entries.items()), f)
+            os.replace(tmp_path, self.path)
+            self._unsaved_changes = 0
+        except OSError as e:
+            logger.warning(f"Could not save photo file_id cache to {self.path}: {e}")
+
+    def get(self, image_url):
+        file_id = self._entries.get(image_url)
+        if file_id is not None: self._entries.move_to_end(image_url)
+        return file_id
+
+    def remember(self, image_url, message):
+        """ပို့ပြီးသား photo message ထဲက (အကြီးဆုံး size) file_id ကို မှတ်"""
+        if not image_url or message is None or not message.photo: return
+        self._entries[image_url] = message.photo[-1].file_id
+        self._entries.move_to_end(image_url)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        self._changed()
+
+    def invalidate(self, image_url):
+        if self._entries.pop(image_url, None) is not None:
+            logger.info(f"Invalidated cached file_id for {image_url}.")
+            self._changed()
+
+    def _changed(self):
+        self._unsaved_changes += 1
+        if self._unsaved_changes >= self.SAVE_EVERY: self.save()
+
+
+PHOTO_FILE_ID_CACHE = PhotoFileIdCache()
+
+
+def is_chat_unreachable(error):
+    """Bot ကို block / kick လုပ်ထား (သို့) chat မရှိတော့လို့ ပြန်ကြိုးစားလည်း ဘယ်တော့မှ ပို့မရမယ့် error"""
+    return isinstance(error, Forbidden) or (isinstance(error, BadRequest) and 'chat not found' in str(error).lower())
+
+
+async def send_with_rate_limit(chat_id, send, messages=1):
+    """Rate limiter ကို စောင့်ပြီး send() ကို ခေါ်၊ RetryAfter ရရင် Telegram ပြောတဲ့အချိန် စောင့်ပြီး ပြန်ကြိုးစား"""
+    attempts = max(1, TELEGRAM_SEND_RETRIES) # 0 ဆိုလည်း အနည်းဆုံး တစ်ခါ ပို့
+    for attempt in range(1, attempts + 1):
+        await TELEGRAM_RATE_LIMITER.acquire(chat_id, messages)
+        try:
+            return await send()
+        except RetryAfter as e:
+            if attempt == attempts: raise
+            retry_after = e.retry_after.total_seconds() if isinstance(e.retry_after, timedelta) else float(e.retry_after)
+            logger.warning(f"Telegram flood limit for chat {chat_id}. Retrying in {retry_after}s (attempt {attempt}).")
+            await asyncio.sleep(retry_after)
+
+
+async def reply_with_rate_limit(message, text, **kwargs):
+    """Status reply (queued / searching / error) တွေကိုလည်း ideas တွေနဲ့ bucket တူ မျှသုံးပြီး ပို့"""
+    return await send_with_rate_limit(message.chat_id, lambda: message.reply_text(text, **kwargs))
+
+
+async def send_single_idea(bot, chat_id, idea):
+    """Idea တစ်ခုကို ပုံ (သို့) စာသား + TradingView button နဲ့ ပို့ (မအောင်မြင်ရင် text fallback)"""
+    image_url = idea.get('image_url')
+    caption = format_message_caption(idea) # Likes ပါတဲ့ caption အသစ်
+    reply_markup = InlineKeyboardMarkup([[InlineKeyboardButton("View on TradingView", url=idea.get('full_link'))]])
+    try:
+        if image_url:
+            logger.info(f"Sending photo for {idea['symbol']} to chat {chat_id}: {idea.get('title')}")
+            send_photo = lambda photo: send_with_rate_limit(chat_id, lambda: bot.send_photo(
+                chat_id=chat_id, photo=photo, caption=caption, parse_mode=ParseMode.HTML, reply_markup=reply_markup))
+            cached_file_id = PHOTO_FILE_ID_CACHE.get(image_url)
+            try:
+                message = await send_photo(cached_file_id or image_url)
+            except BadRequest as e:
+                if not cached_file_id or is_chat_unreachable(e): raise
+                # Cache ထဲက file_id သုံးမရတော့ရင် (invalid / expired) ဖယ်ပြီး မူရင်း URL နဲ့ ပြန်ပို့
+                # TimedOut / NetworkError / RetryAfter ဆို file_id က မှန်နေပြီး ပုံ ရောက်ပြီးသား ဖြစ်နိုင်လို့ cache မဖျက်၊ ထပ်မပို့
+                logger.warning(f"Cached file_id failed for {image_url}: {e}. Retrying with URL.")
+                PHOTO_FILE_ID_CACHE.invalidate(image_url)
+                message = await send_photo(image_url)
+            PHOTO_FILE_ID_CACHE.remember(image_url, message)
+        else:
+            logger.info(f"Sending text (no image) for {idea['symbol']} to chat {chat_id}: {idea.get('title')}")
+            await send_with_rate_limit(chat_id, lambda: bot.send_message(
+                chat_id=chat_id, text=caption, parse_mode=ParseMode.HTML, reply_markup=reply_markup, disable_web_page_preview=False))
+        return True
+    except TelegramError as e:
+        if is_chat_unreachable(e): raise # Text fallback လည်း မရောက်နိုင် - caller (subscription poller) က unsubscribe လုပ်ဖို့
+        logger.error(f"Error sending idea '{idea.get('title')}' to chat {chat_id}: {e}")
+        try:
+            error_caption = caption + f"\n\n<i>(Media ကို ပို့ရာတွင် အမှားအယွင်း ရှိခဲ့နိုင်ပါသည်။)</i>"
+            await send_with_rate_limit(chat_id, lambda: bot.send_message(
+                chat_id=chat_id, text=error_caption, parse_mode=ParseMode.HTML, reply_markup=reply_markup, disable_web_page_preview=True))
+        except Exception as e2: logger.error(f"Error sending text fallback reply: {e2}")
+        return False
+
+
+async def send_idea_media_group(bot, chat_id, batch):
+    """ပုံပါတဲ့ ideas (၂-၁၀ ခု) ကို album တစ်ခုတည်းနဲ့ ပို့ပြီး link button တွေကို နောက်က message တစ်ခုနဲ့ ပို့"""
+    media = [InputMediaPhoto(media=PHOTO_FILE_ID_CACHE.get(idea['image_url']) or idea['image_url'],
+                             caption=format_message_caption(idea), parse_mode=ParseMode.HTML) for idea in batch]
+    try:
+        logger.info(f"Sending media group of {len(batch)} ideas to chat {chat_id}.")
+        messages = await send_with_rate_limit(chat_id, lambda: bot.send_media_group(chat_id=chat_id, media=media), messages=len(media))
+        for idea, message in zip(batch, messages or []):
+            PHOTO_FILE_ID_CACHE.remember(idea['image_url'], message)
+    except TelegramError as e:
+        if is_chat_unreachable(e): raise
+        if not isinstance(e, BadRequest):
+            # TimedOut / NetworkError / RetryAfter ဆို album ရောက်ပြီးသား ဖြစ်နိုင်လို့ တစ်ခုချင်း ထပ်မပို့ (ပုံ ၁၀ ပုံ duplicate မဖြစ်အောင်)
+            logger.error(f"Media group send failed for chat {chat_id}: {e}. Not resending.")
+            return 0
+        # ပုံတစ်ပုံ မှားရင် album တစ်ခုလုံး ကျတတ်လို့ cache ထဲက file_id တွေ ဖယ်ပြီး တစ်ခုချင်း ပြန်ပို့
+        logger.error(f"Media group send failed for chat {chat_id}: {e}. Falling back to single sends.")
+        for idea in batch:
+            PHOTO_FILE_ID_CACHE.invalidate(idea['image_url'])
+        sent = 0
+        for idea in batch:
+            sent += await send_single_idea(bot, chat_id, idea)
+        return sent
+
+    keyboard = [[InlineKeyboardButton(f"{number}. {idea['symbol']} - {idea.get('title', '')[:40]}", url=idea['full_link'])]
+                for number, idea in enumerate(batch, start=1)]
+    try:
+        await send_with_rate_limit(chat_id, lambda: bot.send_message(
+            chat_id=chat_id, text="⬆️ အထက်ပါ ideas များကို TradingView တွင် ကြည့်ရန်:", reply_markup=InlineKeyboardMarkup(keyboard)))
+    except TelegramError as e:
+        logger.error(f"Error sending link buttons for media group to chat {chat_id}: {e}")
+    return len(batch)
+
+
+async def deliver_ideas(bot, chat_id, ideas):
+    """Ideas တွေကို အစဉ်အတိုင်း ပို့ - ဆက်တိုက် ပုံပါတဲ့ ideas တွေကို media group (၁၀ ခုစီ) အဖြစ် စုပို့၊ ပို့ပြီးသား အရေအတွက် ပြန်"""
+    sent_count = 0
+    batch = []
+
+    async def flush():
+        nonlocal sent_count
+        if len(batch) == 1: sent_count += await send_single_idea(bot, chat_id, batch[0])
+        elif batch: sent_count += await send_idea_media_group(bot, chat_id, batch)
+        batch.clear()
+
+    for idea in ideas:
+        if idea.get('image_url'):
+            batch.append(idea)
+            if len(batch) == MEDIA_GROUP_MAX_SIZE: await flush()
+        else:
+            await flush()
+            sent_count += await send_single_idea(bot, chat_id, idea)
+    await flush()
+    return sent_count
+
+
+async def reply_fetch_error(message, symbol, fetch_error):
+    """Symbol တစ်ခု scrape မအောင်မြင်ကြောင်း (timeout / error) user ကို ပြော"""
+    if fetch_error == "timeout": # သတ်မှတ်ချိန်ထက် ကြာသွားရင်
+        await reply_with_rate_limit(message, f"⚠️ `{symbol}` အတွက် Scrape လုပ်ရာတွင် အချိန်ကုန်သွားပါသည်။", parse_mode='Markdown')
+    else: # Scraper မှာ Error တက်ခဲ့ရင်
+        logger.error(f"Selenium scraper failed critically for symbol {symbol}.")
+        await reply_with_rate_limit(message, f"⚠️ `{symbol}` အတွက် Scrape လုပ်ရာတွင် Error ဖြစ်သွားပါသည်။", parse_mode='Markdown')
+
+
+async def stream_ideas_to_chat(bot, message, fetch_futures, listener, request_started):
+    """Symbol အားလုံး ပြီးအောင် မစောင့်ဘဲ scrape ရလာသလို ideas တွေကို ချက်ချင်း ပို့
+
+    Symbol တစ်ခုချင်းရဲ့ ideas တွေက scrape ရတဲ့ အစဉ် (အသစ်ဆုံး အရင်) အတိုင်း ရောက်မယ်၊ job ပြီးမှ Store ထဲက
+    ယခင် သိမ်းထားတဲ့ ideas ကျန်တာတွေ နောက်က လိုက်မယ်။ (found_count, sent_count, fetch_successful) ပြန်။
+    """
+    chat_id = message.chat_id
+    seen_links = set()
+    pending = []
+    sent_count = 0
+    fetch_successful = True
+
+    async def flush():
+        nonlocal sent_count
+        if not pending: return
+        if not sent_count:
+            METRICS.observe("idea_stage_seconds", time.perf_counter() - request_started, stage="first_idea")
+        sent_count += await deliver_ideas(bot, chat_id, pending)
+        pending.clear()
+
+    def add(idea):
+        if idea['full_link'] in seen_links: return
+        seen_links.add(idea['full_link'])
+        pending.append(idea)
+
+    async for kind, symbol, payload in stream_fetch_results(fetch_futures, listener):
+        if kind == 'idea':
+            add(payload)
+        else:
+            ideas_list, fetch_error = payload
+            if fetch_error:
+                fetch_successful = False
+                await flush()
+                await reply_fetch_error(message, symbol, fetch_error)
+                continue
+            for idea in ideas_list: add(idea)
+        # Event ဆက်ရောက်နေရင် album တစ်ခုစာ ပြည့်တဲ့အထိ စုပြီးမှ ပို့
+        if listener.empty() or len(pending) >= MEDIA_GROUP_MAX_SIZE:
+            await flush()
+    await flush()
+    return len(seen_links), sent_count, fetch_successful
+
+# -----------------------------------------------------------------
+# --- Subscription Poller (Symbol တစ်ခု တစ်ခါ scrape -> Subscriber အားလုံးဆီ ပို့) ---
+# -----------------------------------------------------------------
+class SubscriptionPoller:
+    """Subscribe လုပ်ထားတဲ့ symbol တွေကို interval တစ်ခါ scrape ပြီး idea အသစ်တွေကို subscriber chat အားလုံးဆီ ပို့
+
+    Scrape cost က subscriber အရေအတွက် မဟုတ်ဘဲ symbol အရေအတွက်နဲ့ပဲ တိုးမယ် (ScrapeScheduler ကနေ တန်းစီ)။
+    Symbol တစ်ခုကို ပထမဆုံး poll လုပ်တဲ့အခါ လက်ရှိ ideas တွေကို baseline အဖြစ် မှတ်ရုံပဲ (မပို့)။
+    """
+
+    SCHEDULER_USER_ID = "subscriptions" # ScrapeScheduler ထဲမှာ user တစ်ယောက်လို round-robin အလှည့်ယူ
+
+    def __init__(self, interval=SUBSCRIPTION_POLL_SECONDS):
+        self.interval = max(30, interval)
+        self.symbol_count = 0
+        self._primed = set() # Baseline မှတ်ပြီးသား symbol တွေ
+        self._task = None
+
+    def start(self, bot):
+        """Bot ရဲ့ event loop ထဲမှာ poll loop ကို စတင်"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(bot))
+            logger.info(f"Subscription poller started (every {self.interval:.0f}s).")
+
+    async def stop(self):
+        if self._task is None: return
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def _run(self, bot):
+        while True:
+            started = time.monotonic()
+            try:
+                await self.poll_once(bot)
+            except Exception as e:
+                logger.error(f"Subscription poll failed: {e}", exc_info=True)
+            await asyncio.sleep(max(0, self.interval - (time.monotonic() - started)))
+
+    async def poll_once(self, bot):
+        """Subscribe လုပ်ထားတဲ့ symbol အားလုံးကို တစ်ကြိမ်စီ scrape ပြီး idea အသစ်တွေ ပို့"""
+        subscribers = await asyncio.to_thread(IDEA_STORE.subscribers_by_symbol)
+        self.symbol_count = len(subscribers)
+        if not subscribers: return
+        try:
+            # Cache ထဲက (interval တစ်ခါစာ ဟောင်းနိုင်တဲ့) result မဟုတ်ဘဲ အသစ် scrape - idea အသစ်တွေ poll တစ်ခါ နောက်ကျ မရောက်အောင်
+            fetch_futures, _ = await SCRAPE_SCHEDULER.submit(list(subscribers), self.SCHEDULER_USER_ID, bypass_cache=True)
+        except QueueFullError as e:
+            logger.warning(f"{e} Skipping subscription poll for {len(subscribers)} symbols.")
+            METRICS.inc("subscription_polls_skipped_total")
+            return
+        METRICS.inc("subscription_polls_total")
+        # Symbol တစ်ခု scrape ပြီးတာနဲ့ အဲ့ဒီ symbol ရဲ့ subscriber တွေဆီ ချက်ချင်း ပို့
+        await asyncio.gather(*(self._poll_symbol(bot, symbol, chat_ids, fetch_futures[symbol])
+                               for symbol, chat_ids in subscribers.items()))
+
+    async def _poll_symbol(self, bot, symbol, chat_ids, future):
+        ideas_list, fetch_error = (await collect_fetch_results({symbol: future}))[symbol]
+        if fetch_error:
+            logger.warning(f"Subscription poll for {symbol} failed ({fetch_error}).")
+            return
+        notified = await asyncio.to_thread(IDEA_STORE.notified_links, symbol, time.time() - 2 * TIME_FILTER_SECONDS)
+        is_baseline = not notified and symbol not in self._primed
+        self._primed.add(symbol)
+        new_ideas = [idea for idea in ideas_list if idea['full_link'] not in notified]
+        if not new_ideas: return
+        new_links = [idea['full_link'] for idea in new_ideas]
+        if is_baseline:
+            await asyncio.to_thread(IDEA_STORE.mark_notified, symbol, new_links)
+            logger.info(f"Subscription baseline for {symbol}: {len(new_ideas)} existing ideas marked as seen.")
+            return
+
+        logger.info(f"Fanning out {len(new_ideas)} new {symbol} ideas to {len(chat_ids)} subscribed chats.")
+        # ပထမ chat ကို အရင်ပို့ - ပုံ file_id တွေ cache ထဲရောက်မှ ကျန်တဲ့ chat တွေကို ပြိုင်တူ ပို့ (ပုံ ထပ်မ upload ရ)
+        first_chat_id, *other_chat_ids = chat_ids
+        outcomes = await asyncio.gather(self._deliver_to_chat(bot, first_chat_id, new_ideas), return_exceptions=True)
+        outcomes += await asyncio.gather(*(self._deliver_to_chat(bot, chat_id, new_ideas) for chat_id in other_chat_ids),
+                                         return_exceptions=True)
+        for chat_id, outcome in zip(chat_ids, outcomes):
+            if isinstance(outcome, BaseException):
+                logger.error(f"Subscription delivery of {symbol} ideas to chat {chat_id} failed: {outcome}")
+        METRICS.inc("subscription_ideas_sent_total", sum(outcome[0] for outcome in outcomes if isinstance(outcome, tuple)))
+        # Chat အားလုံးဆီ ရောက်မှ (သို့) ပို့မရတဲ့ chat ကို unsubscribe လုပ်ပြီးမှ symbol အတွက် ပို့ပြီးသား မှတ် - မဟုတ်ရင် နောက် poll မှာ ကျန်တဲ့ chat တွေကို ပြန်ပို့
+        if all(isinstance(outcome, tuple) and outcome[1] for outcome in outcomes):
+            await asyncio.to_thread(IDEA_STORE.mark_notified, symbol, new_links)
+
+    async def _deliver_to_chat(self, bot, chat_id, ideas):
+        """Chat တစ်ခုဆီ မပို့ရသေးတဲ့ ideas ကို ပို့ပြီး (sent_count, done) ပြန်
+
+        အားလုံး ရောက်မှ chat အတွက် ပို့ပြီးသား မှတ်မယ် (done=True)။ Bot ကို block လုပ်ထားတဲ့ (သို့) မရှိတော့တဲ့ chat ဆို
+        subscription အားလုံး ဖျက်ပြီး done=True၊ ကျန်တဲ့ error တွေဆို နောက် poll မှာ ပြန်ကြိုးစားဖို့ done=False။
+        """
+        delivered = await asyncio.to_thread(IDEA_STORE.chat_notified_links, chat_id, [idea['full_link'] for idea in ideas])
+        pending = [idea for idea in ideas if idea['full_link'] not in delivered]
+        if not pending: return 0, True
+        try:
+            sent_count = await deliver_ideas(bot, chat_id, pending)
+        except TelegramError as e:
+            if not is_chat_unreachable(e):
+                logger.error(f"Subscription delivery to chat {chat_id} failed: {e}")
+                return 0, False
+            removed = await asyncio.to_thread(IDEA_STORE.remove_subscriptions, chat_id)
+            logger.warning(f"Chat {chat_id} is unreachable ({e}). Unsubscribed it from [{','.join(removed)}].")
+            METRICS.inc("subscriptions_removed_total", len(removed), reason="unreachable")
+            return 0, True
+        if sent_count < len(pending):
+            logger.warning(f"Only {sent_count} of {len(pending)} subscription ideas reached chat {chat_id}. Retrying next poll.")
+            return sent_count, False
+        await asyncio.to_thread(IDEA_STORE.mark_chat_notified, chat_id, [idea['full_link'] for idea in pending])
+        return sent_count, True
+
+
+SUBSCRIPTION_POLLER = SubscriptionPoller()
+METRICS.gauge("subscribed_symbols", lambda: SUBSCRIPTION_POLLER.symbol_count)
+
 # -----------------------------------------------------------------
 # --- Bot Logic (Selenium Version, Advanced Reply Logic) ---
 # -----------------------------------------------------------------
@@ -283,7 +2090,8 @@ async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """/start command - အသုံးပြုနည်း ရှင်းပြ"""
     user = update.message.from_user
     logger.info(f"/start command received from user {user.id} ({user.username})")
-    await update.message.reply_text(
+    await reply_with_rate_limit(
+        update.message,
         f"မင်္ဂလာပါ MCM TradingIdeas Bot မှကြိုဆိုပါတယ်{user.first_name}!\n\n"
         f"Crypto pair အတွက် TradingView idea များကို ရယူရန်:\n\n"
         f"➡️ နောက်ဆုံး idea တစ်ခုတည်းကို ရယူရန်:\n"
@@ -292,6 +2100,8 @@ async def start_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         f"➡️ နောက်ဆုံး ၂၄ နာရီအတွင်း idea အားလုံးကို တစ်ခုချင်း ရယူရန်:\n"
         f"`/idea SYMBOL1,SYMBOL2,...` (ကော်မာခံ၍)\n"
         f"(ဥပမာ: `/idea BTCUSDT,ETHUSDT,SOLUSDT`)\n\n"
+        f"➡️ Idea အသစ် ထွက်တိုင်း အလိုအလျောက် ရယူရန်:\n"
+        f"`/subscribe SYMBOL1,SYMBOL2,...` (ရပ်ရန် `/unsubscribe` သို့မဟုတ် `/unsubscribe SYMBOL`)\n\n"
         f"Bot သည် ideas များကို ရှာဖွေပြီး သင့်ထံ တိုက်ရိုက် ပြန်လည် ပေးပို့ပါမည်။ (Selenium ကို အသုံးပြုထားပါသည်။)", # Selenium သုံးကြောင်း ထည့်ရေးထား
         parse_mode='Markdown'
     )
@@ -304,60 +2114,78 @@ async def idea_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     # ... (Argument parsing အရင်အတိုင်း) ...
     if not context.args:
         logger.warning(f"User {user.id} called /idea without arguments.")
-        await update.message.reply_text("ကျေးဇူးပြု၍ Symbol တစ်ခု သို့မဟုတ် တစ်ခုထက်ပို၍ (ကော်မာခံပြီး) ထည့်ပေးပါ။\nဥပမာ: `/idea BTCUSDT` သို့မဟုတ် `/idea BTCUSDT,ETHUSDT`", parse_mode='Markdown')
+        await reply_with_rate_limit(update.message, "ကျေးဇူးပြု၍ Symbol တစ်ခု သို့မဟုတ် တစ်ခုထက်ပို၍ (ကော်မာခံပြီး) ထည့်ပေးပါ။\nဥပမာ: `/idea BTCUSDT` သို့မဟုတ် `/idea BTCUSDT,ETHUSDT`", parse_mode='Markdown')
         return
     symbols_input = "".join(context.args)
     symbols_to_fetch = [s.strip().upper() for s in symbols_input.split(',') if s.strip()]
     if not symbols_to_fetch:
         logger.warning(f"User {user.id} provided empty symbols.")
-        await update.message.reply_text("Symbol များ မှားယွင်းနေပါသည်။\nဥပမာ: `/idea BTCUSDT`", parse_mode='Markdown')
+        await reply_with_rate_limit(update.message, "Symbol များ မှားယွင်းနေပါသည်။\nဥပမာ: `/idea BTCUSDT`", parse_mode='Markdown')
         return
     log_symbols = ",".join(symbols_to_fetch)
     logger.info(f"/idea command received for symbols: [{log_symbols}] from user {user.id} ({user.username})")
-
-    # ... (Cooldown check အရင်အတိုင်း) ...
-    global IS_CURRENTLY_SCRAPING
-    if IS_CURRENTLY_SCRAPING:
-        logger.warning(f"Scraper is already running. User {user.id} tried to call /idea [{log_symbols}].")
-        await update.message.reply_text("Bot သည် ယခုလက်ရှိ အခြား request တစ်ခုကို လုပ်ဆောင်နေပါသည်။ ပြီးဆုံးမှ နောက်တစ်ကြိမ် ပြန်လည် ကြိုးစားပါ။")
-        return
+    METRICS.inc("idea_requests_total")
+    request_started = time.perf_counter()
 
     is_single_symbol_request = len(symbols_to_fetch) == 1
+    listener = asyncio.Queue() if STREAM_DELIVERY and not is_single_symbol_request else None
+
+    # ... (Queue ထဲ ထည့် - ပြည့်နေမှသာ ငြင်း) ...
+    try:
+        fetch_futures, queue_position = await SCRAPE_SCHEDULER.submit(symbols_to_fetch, user.id, listener)
+    except QueueFullError as e:
+        logger.warning(f"{e} User {user.id} tried to call /idea [{log_symbols}].")
+        METRICS.inc("idea_requests_rejected_total", reason="queue_full")
+        await reply_with_rate_limit(update.message, "Bot သည် ယခုလက်ရှိ request များစွာကို လုပ်ဆောင်နေပါသည်။ ခဏကြာမှ နောက်တစ်ကြိမ် ပြန်လည် ကြိုးစားပါ။")
+        return
 
     try:
-        IS_CURRENTLY_SCRAPING = True
-        await update.message.reply_text(f"TradingView မှ `{log_symbols}` အတွက် Ideas များကို Selenium ဖြင့် ရှာဖွေနေပါသည်။ ဤလုပ်ငန်းစဉ်သည် **၁-၂ မိနစ်ခန့်** ကြာနိုင်ပါသည်။ ခဏစောင့်ပါ...", parse_mode='Markdown') # အချိန်ပိုကြာနိုင်ကြောင်း ထည့်ရေးထား
+        if queue_position:
+            await reply_with_rate_limit(update.message, f"သင့် request ကို တန်းစီထားပါသည်။ (တန်းစီ နံပါတ်: {queue_position})")
+        await reply_with_rate_limit(update.message, f"TradingView မှ `{log_symbols}` အတွက် Ideas များကို Selenium ဖြင့် ရှာဖွေနေပါသည်။ ဤလုပ်ငန်းစဉ်သည် **၁-၂ မိနစ်ခန့်** ကြာနိုင်ပါသည်။ ခဏစောင့်ပါ...", parse_mode='Markdown') # အချိန်ပိုကြာနိုင်ကြောင်း ထည့်ရေးထား
+
+        if listener is not None:
+            # --- Symbol တစ်ခုချင်း scrape ရလာသလို ချက်ချင်း ပို့ (Streaming) ---
+            with METRICS.timer("idea_stage_seconds", stage="stream"): # Queue wait + scrape + send
+                found_count, sent_count, fetch_successful = await stream_ideas_to_chat(
+                    context.bot, update.message, fetch_futures, listener, request_started)
+            METRICS.inc("ideas_sent_total", sent_count)
+            if not found_count and not fetch_successful:
+                await reply_with_rate_limit(update.message, f"တောင်းဆိုထားသော Symbol များအတွက် Idea များ ရယူရာတွင် အမှားအယွင်းများ ဖြစ်ပေါ်ခဲ့ပါသည်။")
+            elif not found_count:
+                await reply_with_rate_limit(update.message, f"တောင်းဆိုထားသော Symbol များ (`{log_symbols}`) အတွက် နောက်ဆုံး ၂၄ နာရီအတွင်း idea အသစ်များ ရှာမတွေ့ပါ။", parse_mode='Markdown')
+            logger.info(f"Finished streaming /idea [{log_symbols}] for user {user.id}. Sent {sent_count} of {found_count} ideas.")
+            return
 
-        all_recent_ideas = []
+        fetched_symbols = []
         fetch_successful = True
 
-        # --- !!! Selenium Scraper ကို Thread သီးသန့်မှာ ခေါ်ပါ !!! ---
+        # --- !!! Scheduler worker တွေက Selenium Scraper ကို Thread သီးသန့်တွေမှာ ပြိုင်တူ ခေါ်မယ် !!! ---
+        with METRICS.timer("idea_stage_seconds", stage="fetch"): # Queue wait + scrape
+            fetch_results = await collect_fetch_results(fetch_futures)
         for symbol in symbols_to_fetch:
-            logger.info(f"Calling Selenium scraper for {symbol} in a separate thread...")
             # fetch_ideas_selenium က list (ideas) or [] or None ပြန်ပေးမယ်
-            ideas_list = await asyncio.to_thread(fetch_ideas_selenium, symbol) # <-- Selenium function ကို ခေါ်
-            logger.info(f"Selenium scraper for {symbol} finished.")
+            ideas_list, fetch_error = fetch_results[symbol]
 
-            if ideas_list is None: # Scraper မှာ Error တက်ခဲ့ရင်
-                 logger.error(f"Selenium scraper failed critically for symbol {symbol}.")
+            if fetch_error: # Timeout (သို့) Scraper မှာ Error တက်ခဲ့ရင်
                  fetch_successful = False
-                 await update.message.reply_text(f"⚠️ `{symbol}` အတွက် Scrape လုပ်ရာတွင် Error ဖြစ်သွားပါသည်။", parse_mode='Markdown')
+                 await reply_fetch_error(update.message, symbol, fetch_error)
                  continue
-            elif ideas_list: # ideas တွေ့ရင် ပေါင်းထည့် (အချိန် filter လုပ်ပြီးသား)
-                all_recent_ideas.extend(ideas_list)
+            fetched_symbols.append(symbol)
+
+        # --- ၂၄ နာရီအတွင်း ideas ကို Store ရဲ့ (symbol, published_time) index ကနေ နောက်ဆုံး အရင် ဖတ် ---
+        with METRICS.timer("idea_stage_seconds", stage="store_query"):
+            all_recent_ideas = await asyncio.to_thread(IDEA_STORE.recent_ideas, fetched_symbols)
 
         # --- (ကျန်တဲ့ Result Handling & Reply Logic က အရင်အတိုင်းနီးပါး) ---
         if not fetch_successful and not all_recent_ideas:
-             await update.message.reply_text(f"တောင်းဆိုထားသော Symbol များအတွက် Idea များ ရယူရာတွင် အမှားအယွင်းများ ဖြစ်ပေါ်ခဲ့ပါသည်။")
+             await reply_with_rate_limit(update.message, f"တောင်းဆိုထားသော Symbol များအတွက် Idea များ ရယူရာတွင် အမှားအယွင်းများ ဖြစ်ပေါ်ခဲ့ပါသည်။")
              return
         if not all_recent_ideas:
             logger.info(f"Selenium scraper returned no recent ideas for symbols: [{log_symbols}].")
-            await update.message.reply_text(f"တောင်းဆိုထားသော Symbol များ (`{log_symbols}`) အတွက် နောက်ဆုံး ၂၄ နာရီအတွင်း idea အသစ်များ ရှာမတွေ့ပါ။", parse_mode='Markdown')
+            await reply_with_rate_limit(update.message, f"တောင်းဆိုထားသော Symbol များ (`{log_symbols}`) အတွက် နောက်ဆုံး ၂၄ နာရီအတွင်း idea အသစ်များ ရှာမတွေ့ပါ။", parse_mode='Markdown')
             return
 
-        # Sort all collected ideas by time, most recent first
-        all_recent_ideas.sort(key=lambda x: x['published_time'], reverse=True)
-
         ideas_to_send = []
         if is_single_symbol_request:
             ideas_to_send = all_recent_ideas[:1]
@@ -367,70 +2195,203 @@ async def idea_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
             count_text = f"နောက်ဆုံး ၂၄ နာရီအတွင်း idea {len(ideas_to_send)} ခု"
 
         if not ideas_to_send:
-             await update.message.reply_text(f"`{log_symbols}` အတွက် နောက်ဆုံး ၂၄ နာရီအတွင်း idea အသစ်များ ရှာမတွေ့ပါ။", parse_mode='Markdown')
+             await reply_with_rate_limit(update.message, f"`{log_symbols}` အတွက် နောက်ဆုံး ၂၄ နာရီအတွင်း idea အသစ်များ ရှာမတွေ့ပါ။", parse_mode='Markdown')
              return
 
-        await update.message.reply_text(f"`{log_symbols}` အတွက် {count_text} တွေ့ရှိပါသည်။ ပေးပို့နေပါသည်...", parse_mode='Markdown')
+        await reply_with_rate_limit(update.message, f"`{log_symbols}` အတွက် {count_text} တွေ့ရှိပါသည်။ ပေးပို့နေပါသည်...", parse_mode='Markdown')
 
-        sent_count = 0
-        for idea in ideas_to_send:
-            image_url = idea.get('image_url')
-            full_link = idea.get('full_link')
-            caption = format_message_caption(idea) # Likes ပါတဲ့ caption အသစ်
-            keyboard = [[InlineKeyboardButton("View on TradingView", url=full_link)]]
-            reply_markup = InlineKeyboardMarkup(keyboard)
-
-            try:
-                if image_url:
-                    logger.info(f"Replying with photo for {idea['symbol']} to user {user.id}: {idea.get('title')}")
-                    await update.message.reply_photo( photo=image_url, caption=caption, parse_mode=ParseMode.HTML, reply_markup=reply_markup )
-                else:
-                    logger.info(f"Replying with text (no image) for {idea['symbol']} to user {user.id}: {idea.get('title')}")
-                    await update.message.reply_text( text=caption, parse_mode=ParseMode.HTML, reply_markup=reply_markup, disable_web_page_preview=False)
-                sent_count += 1
-                await asyncio.sleep(1.5)
-
-            except TelegramError as e:
-                logger.error(f"Error replying to user {user.id} for idea '{idea.get('title')}': {e}")
-                try:
-                    error_caption = caption + f"\n\n<i>(Media ကို ပို့ရာတွင် အမှားအယွင်း ရှိခဲ့နိုင်ပါသည်။)</i>"
-                    await update.message.reply_text( text=error_caption, parse_mode=ParseMode.HTML,
-                        reply_markup=reply_markup, disable_web_page_preview=True)
-                    await asyncio.sleep(0.5)
-                except Exception as e2: logger.error(f"Error sending text fallback reply: {e2}")
+        with METRICS.timer("idea_stage_seconds", stage="telegram_send"):
+            sent_count = await deliver_ideas(context.bot, chat_id, ideas_to_send)
+        METRICS.inc("ideas_sent_total", sent_count)
 
         logger.info(f"Finished processing /idea [{log_symbols}] for user {user.id}. Sent {sent_count} replies.")
 
     except Exception as e:
         logger.error(f"Error in /idea command handler for [{log_symbols}]: {e}", exc_info=True)
+        METRICS.inc("idea_request_errors_total")
         try:
-            await update.message.reply_text(f"အမှားအယွင်း တစ်ခုခု ဖြစ်သွားပါသည်: {e}")
+            await reply_with_rate_limit(update.message, f"အမှားအယွင်း တစ်ခုခု ဖြစ်သွားပါသည်: {e}")
         except Exception: pass
     finally:
-        IS_CURRENTLY_SCRAPING = False
-        logger.info("Scraping lock released.")
+        METRICS.observe("idea_stage_seconds", time.perf_counter() - request_started, stage="total")
+        logger.info(f"/idea [{log_symbols}] for user {user.id} done. Scrape queue depth: {SCRAPE_SCHEDULER.queue_depth}. Idea cache: {IDEA_CACHE.stats()}")
+
+async def subscribe_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """/subscribe SYMBOL1,SYMBOL2 - Idea အသစ် ထွက်တိုင်း ဒီ chat ကို ပို့ (Argument မပါရင် subscription list ပြ)"""
+    user = update.message.from_user
+    chat_id = update.message.chat_id
+    symbols = [s.strip().upper() for s in "".join(context.args or []).split(',') if s.strip()]
+    current = await asyncio.to_thread(IDEA_STORE.subscriptions, chat_id)
+    if not symbols:
+        if current:
+            await reply_with_rate_limit(update.message, f"Subscribe လုပ်ထားသော Symbol များ: `{','.join(current)}`", parse_mode='Markdown')
+        else:
+            await reply_with_rate_limit(update.message, "Subscribe လုပ်ရန် Symbol ထည့်ပေးပါ။\nဥပမာ: `/subscribe BTCUSDT` သို့မဟုတ် `/subscribe BTCUSDT,ETHUSDT`", parse_mode='Markdown')
+        return
+
+    new_symbols = [symbol for symbol in dict.fromkeys(symbols) if symbol not in current]
+    if len(current) + len(new_symbols) > SUBSCRIPTION_MAX_SYMBOLS_PER_CHAT:
+        logger.warning(f"User {user.id} tried to subscribe chat {chat_id} to more than {SUBSCRIPTION_MAX_SYMBOLS_PER_CHAT} symbols.")
+        await reply_with_rate_limit(update.message, f"Chat တစ်ခုလျှင် Symbol {SUBSCRIPTION_MAX_SYMBOLS_PER_CHAT} ခုအထိသာ subscribe လုပ်နိုင်ပါသည်။")
+        return
+    for symbol in new_symbols:
+        await asyncio.to_thread(IDEA_STORE.add_subscription, chat_id, symbol)
+    logger.info(f"Chat {chat_id} (user {user.id}) subscribed to [{','.join(new_symbols)}].")
+    METRICS.inc("subscriptions_added_total", len(new_symbols))
+    await reply_with_rate_limit(
+        update.message,
+        f"`{','.join(dict.fromkeys(symbols))}` အတွက် idea အသစ်များ ထွက်တိုင်း ပေးပို့ပါမည်။ "
+        f"(မိနစ် {SUBSCRIPTION_POLLER.interval / 60:.0f} ခုတိုင်း စစ်ဆေးပါသည်)", parse_mode='Markdown')
+
+async def unsubscribe_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """/unsubscribe [SYMBOL1,SYMBOL2] - Symbol (မပါရင် အားလုံး) ကို ရပ်"""
+    chat_id = update.message.chat_id
+    symbols = [s.strip().upper() for s in "".join(context.args or []).split(',') if s.strip()]
+    removed = await asyncio.to_thread(IDEA_STORE.remove_subscriptions, chat_id, symbols or None)
+    if not removed:
+        await reply_with_rate_limit(update.message, "ရပ်ရန် subscription မရှိပါ။")
+        return
+    logger.info(f"Chat {chat_id} unsubscribed from [{','.join(removed)}].")
+    await reply_with_rate_limit(update.message, f"`{','.join(removed)}` အတွက် subscription ကို ရပ်လိုက်ပါပြီ။", parse_mode='Markdown')
+
+async def stats_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """/stats command - Admin အတွက် stage timing / counter / queue / cache အခြေအနေ ပြ"""
+    user = update.message.from_user
+    if ADMIN_USER_ID is None or user.id != ADMIN_USER_ID:
+        logger.warning(f"Non-admin user {user.id} ({user.username}) tried to call /stats.")
+        return
+    text = (f"Scrape queue depth: {SCRAPE_SCHEDULER.queue_depth}\n"
+            f"Idea cache: {IDEA_CACHE.stats()}\n\n"
+            f"{METRICS.summary_text()}")
+    await reply_with_rate_limit(update.message, text[:4000]) # Telegram message limit
 
 # --- Bot ကို Run မယ့် Main Function (Polling Version - Graceful Shutdown Fix) ---
+def build_application(request=None):
+    """Handler တွေ ထည့်ပြီးသား Application ဆောက် (request: Bot API HTTP layer ကို အစားထိုးချင်ရင် - benchmark အတွက်)"""
+    # /idea တွေ ပြိုင်တူ dispatch ဖြစ်မှ ScrapeScheduler ရဲ့ queue position / single-flight / round-robin က တကယ် အလုပ်လုပ်
+    builder = Application.builder().token(BOT_TOKEN).concurrent_updates(max(1, CONCURRENT_UPDATES))
+    if CONCURRENT_UPDATES <= 1 and SCRAPE_CONCURRENCY > 1:
+        logger.warning(f"CONCURRENT_UPDATES={CONCURRENT_UPDATES}: /idea requests are handled one at a time, "
+                       "so other users wait for the running scrape instead of queueing on the scheduler.")
+    if request is not None: builder = builder.request(request)
+    application = builder.build()
+
+    application.add_handler(CommandHandler("start", start_command))
+    application.add_handler(CommandHandler("idea", idea_command))
+    application.add_handler(CommandHandler("subscribe", subscribe_command))
+    application.add_handler(CommandHandler("unsubscribe", unsubscribe_command))
+    application.add_handler(CommandHandler("stats", stats_command))
+    return application
+
+# -----------------------------------------------------------------
+# --- Webhook Server (BOT_MODE=webhook) ---
+# -----------------------------------------------------------------
+async def handle_webhook_request(application, reader, writer):
+    """Telegram က POST လုပ်တဲ့ update ကို application.update_queue ထဲ ထည့်ပြီး ချက်ချင်း 200 ပြန် (Handler ပြီးအောင် မစောင့်)"""
+    try:
+        request_line = await asyncio.wait_for(reader.readline(), 5)
+        headers = {}
+        while (line := await asyncio.wait_for(reader.readline(), 5)) not in (b"\r\n", b"\n", b""):
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+        parts = request_line.decode('latin-1').split()
+        method, path = (parts[0], parts[1].split('?')[0]) if len(parts) >= 2 else ('', '')
+
+        if method == 'GET' and path == '/healthz':
+            status, body = "200 OK", b"ok\n"
+        elif method != 'POST' or path != WEBHOOK_PATH:
+            status, body = "404 Not Found", b"not found\n"
+        elif WEBHOOK_SECRET_TOKEN and not hmac.compare_digest(
+                headers.get('x-telegram-bot-api-secret-token', ''), WEBHOOK_SECRET_TOKEN):
+            logger.warning("Rejected webhook request with a wrong secret token.")
+            status, body = "403 Forbidden", b"forbidden\n"
+        else:
+            try:
+                length = int(headers.get('content-length', 0))
+                if not 0 < length <= WEBHOOK_MAX_BODY_BYTES: raise ValueError(f"bad content length {length}")
+                payload = await asyncio.wait_for(reader.readexactly(length), 10)
+                update = Update.de_json(json.loads(payload), application.bot)
+            except (ValueError, TypeError, KeyError, AttributeError) as e:
+                logger.warning(f"Rejected malformed webhook update: {e}")
+                status, body = "400 Bad Request", b"bad request\n"
+            else:
+                await application.update_queue.put(update)
+                METRICS.inc("webhook_updates_total")
+                status, body = "200 OK", b"ok\n"
+
+        writer.write(f"HTTP/1.1 {status}\r\nContent-Type: text/plain\r\n"
+                     f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body)
+        await writer.drain()
+    except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError) as e:
+        logger.debug(f"Webhook request failed: {e}")
+    finally:
+        writer.close()
+
+
+async def start_webhook_server(application, host=WEBHOOK_LISTEN, port=WEBHOOK_PORT):
+    """Webhook HTTP server စတင်ပြီး WEBHOOK_URL ပေးထားရင် Telegram မှာ webhook register လုပ်"""
+    server = await asyncio.start_server(lambda reader, writer: handle_webhook_request(application, reader, writer), host, port)
+    logger.info(f"Webhook endpoint listening on http://{host}:{server.sockets[0].getsockname()[1]}{WEBHOOK_PATH}")
+    if WEBHOOK_URL:
+        await application.bot.set_webhook(url=WEBHOOK_URL, secret_token=WEBHOOK_SECRET_TOKEN or None,
+                                          allowed_updates=Update.ALL_TYPES, max_connections=min(100, max(1, CONCURRENT_UPDATES)))
+        logger.info(f"Telegram webhook set to {WEBHOOK_URL}.")
+    return server
+
+# --- Bot ကို Run မယ့် Main Function (Polling / Webhook - SIGTERM မှာ Graceful Shutdown) ---
 async def main():
     """Bot ကို စတင် အလုပ်လုပ်ခိုင်းမယ်"""
     print("Bot စတင် အလုပ်လုပ်ပါပြီ။ Command များကို နားထောင်နေပါသည်...")
 
     # load_posted_ideas() # <-- မလိုတော့
 
-    application = Application.builder().token(BOT_TOKEN).build()
+    application = build_application()
 
-    application.add_handler(CommandHandler("start", start_command))
-    application.add_handler(CommandHandler("idea", idea_command))
+    # SIGTERM (Docker / systemd / Render) နဲ့ Ctrl+C ကို လက်ခံပြီး လက်ရှိ update တွေ ပြီးမှ ရပ်
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop_event.set)
+        except (NotImplementedError, AttributeError): # Windows - Ctrl+C က KeyboardInterrupt အဖြစ် ရောက်မယ်
+            pass
 
-    print("Bot polling ကို စတင်ပါပြီ... (Ctrl+C နှိပ်ပြီး ရပ်နိုင်သည်)")
+    print(f"Bot {BOT_MODE} mode ကို စတင်ပါပြီ... (Ctrl+C နှိပ်ပြီး ရပ်နိုင်သည်)")
 
-    async with application:
-        await application.initialize()
-        await application.start()
-        await application.updater.start_polling(allowed_updates=Update.ALL_TYPES)
+    # Chrome driver တွေ (process mode ဆို worker process တွေ) ကို background မှာ ကြိုဖွင့်ထား
+    driver_pool = SCRAPER_PROCESS_POOL if SCRAPER_MODE == 'process' else DRIVER_POOL
+    warm_up_task = asyncio.create_task(asyncio.to_thread(driver_pool.warm_up))
+    PHOTO_FILE_ID_CACHE.load()
+    await SCRAPE_SCHEDULER.start()
+    metrics_server = await start_metrics_server()
+    webhook_server = None
 
-        while True:
-            await asyncio.sleep(3600)
+    try:
+        async with application:
+            await application.start()
+            if BOT_MODE == 'webhook':
+                webhook_server = await start_webhook_server(application)
+            else:
+                await application.updater.start_polling(allowed_updates=Update.ALL_TYPES)
+            SUBSCRIPTION_POLLER.start(application.bot)
+
+            await stop_event.wait()
+            logger.info("Shutdown signal received. Finishing in-flight updates...")
+            # Update အသစ် လက်မခံတော့ဘဲ queue ထဲ ရောက်ပြီးသား update တွေ ပြီးအောင် application.stop() က စောင့်
+            if webhook_server is not None: webhook_server.close()
+            elif application.updater.running: await application.updater.stop()
+            await SUBSCRIPTION_POLLER.stop()
+            await application.stop()
+    finally:
+        if webhook_server is not None: webhook_server.close()
+        if metrics_server is not None: metrics_server.close()
+        await SUBSCRIPTION_POLLER.stop()
+        await SCRAPE_SCHEDULER.stop()
+        await close_http_client()
+        IDEA_STORE.close()
+        PHOTO_FILE_ID_CACHE.save()
+        await asyncio.to_thread(driver_pool.shutdown)
+        await warm_up_task # Warm-up မပြီးသေးရင် ဖွင့်ပြီးသား driver ကို သူ့ဘာသာ ပိတ်သွားမယ်
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file